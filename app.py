@@ -1,29 +1,24 @@
-import pybase64
+import hashlib
 import io
-import os
+import json
 import time
-from dotenv import load_dotenv
+import uuid
 import pymongo
 from pymongo import MongoClient
 import streamlit as st
 from PIL import Image
-import PyPDF2 as pdf
-import google.generativeai as genai
-
-load_dotenv()
-genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
-
-# --------------------------
-# Core Functionality (Unchanged)
-# --------------------------
-def get_gemini_response(input_text):
-    model = genai.GenerativeModel('gemini-2.0-flash')
-    response = model.generate_content(input_text)
-    return response.text
-
-def input_pdf_text(uploaded_file):
-    reader = pdf.PdfReader(uploaded_file)
-    return "".join(page.extract_text() or '' for page in reader.pages)
+from gemini import (analysis_model, cached_gemini_response, cached_gemini_stream,
+                    in_flight, response_cache)
+from assets import background_html, stylesheet_html
+from pdf_text import input_pdf_text
+from resume_parser import analysis_text, parse_pdf
+from jobs import get_job_queue
+import tracing
+from keyword_scorer import format_match_report, score_match
+from semantic import semantic_match
+from structured_output import json_template, match_data, structured_analysis
+from prompts import (ANALYSES, FULL_REPORT_KEYS, FULL_REPORT_TEMPLATE,
+                     build_match_thoughts_template, split_full_report, with_skill_hints)
 
 # --------------------------
 # UI Configuration
@@ -36,30 +31,14 @@ st.set_page_config(
 )
 
 # Load custom CSS
-with open("styles/main.css") as f:
-    st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+st.markdown(stylesheet_html("styles/main.css"), unsafe_allow_html=True)
 
 # Background image with overlay
 def set_background(image_path):
-    with open(image_path, "rb") as file:
-        encoded_image = pybase64.b64encode(file.read()).decode()
-    
-    background_style = f"""
-    <style>
-    .stApp {{
-        background: linear-gradient(
-            rgba(0, 0, 0, 0.6),
-            rgba(0, 0, 0, 0.6)
-        ), url("data:image/png;base64,{encoded_image}");
-        background-size: cover;
-        background-position: center;
-        background-attachment: fixed;
-    }}
-    </style>
-    """
-    st.markdown(background_style, unsafe_allow_html=True)
+    st.markdown(background_html(image_path, overlay="rgba(0, 0, 0, 0.6)"),
+                unsafe_allow_html=True)
 
-set_background("bg.jpg")  # Set your background image
+set_background("background.JPG")  # Set your background image
 
 # --------------------------
 # Sidebar Configuration
@@ -75,6 +54,28 @@ with st.sidebar:
     jd = st.text_area("Job Description", height=200,
                      placeholder="Paste full job description here...")
     uploaded_file = st.file_uploader("Upload Resume (PDF)", type="pdf")
+    report_mode = st.radio("Full Report Mode", ("Single request", "Parallel requests"),
+                           help="Single request sends the resume once; parallel "
+                                "requests run the analyses side by side. Either "
+                                "way the match percentage is scored locally.")
+    regenerate = st.checkbox("Regenerate (ignore saved answers)")
+    stream_output = st.checkbox("Stream responses", value=True,
+                                help="Show each answer as it is written.")
+    structured_output = st.checkbox("Structured output (JSON)",
+                                    help="Ask for JSON, validate it and offer it "
+                                         "for download next to each card.")
+    cache_stats = response_cache.stats()
+    st.caption(f"Response cache: {cache_stats['hits']} hits · "
+               f"{cache_stats['misses']} misses · {cache_stats['entries']} saved · "
+               f"{in_flight.coalesced} shared in flight")
+    if tracing.enabled():
+        with st.expander("🛠️ Trace (recent spans)"):
+            st.caption(f"Also written to {tracing.TRACE_PATH}")
+            st.dataframe([{"span": s.name, "ms": round(s.duration_ms, 1),
+                           "status": "error" if s.error else "ok",
+                           "attributes": ", ".join(f"{k}={v}" for k, v in s.attributes.items())}
+                          for s in tracing.recent_spans()[:50]],
+                         use_container_width=True, hide_index=True)
 
 # --------------------------
 # Main Content Area
@@ -106,7 +107,7 @@ st.markdown("""
 # Analysis Tools
 # --------------------------
 st.markdown("### 🔍 Analysis Tools")
-button_cols = st.columns(5)
+button_cols = st.columns(6)
 with button_cols[0]:
     submit1 = st.button("Resume Analysis", use_container_width=True)
 with button_cols[1]:
@@ -117,6 +118,8 @@ with button_cols[3]:
     submit4 = st.button("Customization Tips", use_container_width=True)
 with button_cols[4]:
     submit5 = st.button("Interview Prep", use_container_width=True)
+with button_cols[5]:
+    submit_all = st.button("Full Report", use_container_width=True, type="primary")
 
 # --------------------------
 # Validation & Processing
@@ -142,260 +145,211 @@ def create_response_card(title, content):
     </div>
     """
 
-# Handle button actions
-def handle_analysis(prompt_template, title):
-    if validate_inputs():
-        text = input_pdf_text(uploaded_file)
-        with st.spinner('🔍 Analyzing documents...'):
-            try:
-                prompt = prompt_template.format(
-                    role=role,
-                    text=text,
-                    jd=jd
-                )
-                response = get_gemini_response(prompt)
-                st.markdown(create_response_card(title, response),
-                          unsafe_allow_html=True)
-            except Exception as e:
-                st.error(f"Error processing request: {str(e)}")
-
-# Process button clicks
-if submit1:
-    if len(role) > 0:
-        if uploaded_file is not None:
-            text = input_pdf_text(uploaded_file)
-            if len(jd) > 0:
-                with st.spinner('Please Wait..'):
-                    prompt1 = f"""
-                    You are a professional and experienced ATS(Application Tracking System) with a deep understanding of {role} fields. Analyze the provided resume and job description (JD). Provide a detailed analysis (200-300 words) of how the resume aligns with the JD, highlighting key areas of strength, relevant experiences, and qualifications. Discuss any notable achievements or skills that are particularly well-matched to the job requirements.
-                    
-                    Here is the resume content : {text}
-                    Here is the job description : {jd}
-                    Your Response Should have the following structure
-                    Example:
-                    
-                    Note: Only Mention and Analyze the content of the provided resume text. Make sure Nothing additional is added outside the provided text 
-                    
-                    Resume Analysis and Alignment with Job Description:
-
-                    Overview: 
-                    The resume presents a strong background in software engineering, with a particular emphasis on full-stack development and cloud technologies.
-                    
-                    Strengths:
-                    - Technical Proficiency: Proficient in key programming languages such as Python, JavaScript, and Java, aligning well with the job's technical requirements.
-                    - Project Experience: Showcases several projects that demonstrate the ability to design, develop, and deploy scalable software solutions, mirroring the JD's emphasis on hands-on experience.
-                    
-                    Relevant Experiences: (Highlight only the things that are present in the resume.)
-                    - Lead Developer Role: Led a team in developing a SaaS application using microservices architecture, directly relevant to the job's focus on leadership and microservices.
-                    - Cloud Solutions Architect: Experience in designing cloud infrastructure on AWS, aligning with the JD's requirement for cloud computing skills.
-                    
-                    """
+# Card rendered from validated JSON, with the data itself downloadable.
+def show_structured_card(key, title, data, markdown):
+    st.markdown(create_response_card(title, markdown), unsafe_allow_html=True)
+    st.download_button(f"⬇️ {title} (JSON)", json.dumps(data, indent=2),
+                       file_name=f"{key}.json", mime="application/json",
+                       key=f"json-{key}")
+
+# Meaning-level overlap between resume and JD, computed locally as a second
+# signal next to the keyword match.
+def show_semantic_match(semantic):
+    st.metric("Semantic Similarity", f"{semantic['score']}%",
+              help="Average similarity of each JD requirement to its closest resume passage.")
+    if semantic["requirements"]:
+        with st.expander("Least covered JD requirements"):
+            for line, similarity, _ in semantic["requirements"][:5]:
+                st.write(f"- {line} ({similarity:.2f})")
 
-                    response = get_gemini_response(prompt1)
-                st.write(response)  # Use st.write to display the response
-            else:
-                st.error("No job description provided.")
-            
-        else:
-            st.error("No job description provided.")
-            st.error("Resume Not Uploaded.")
+# --------------------------
+# Background analyses
+# --------------------------
+# Each request runs as a job on the shared queue (jobs.py) and is tracked in
+# st.session_state.analysis_jobs (card id -> entry). Cards are drawn from
+# those entries on every run, so typing in the sidebar or any other rerun
+# neither stops a running analysis nor starts it again.
+JOB_POLL_SECONDS = 1.0
+
+if "session_id" not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
+if "analysis_jobs" not in st.session_state:
+    st.session_state.analysis_jobs = {}
+
+def submit_job(card_id, title, kind, fn, *args, extra=None, **kwargs):
+    # The same card with the same inputs joins the job already running.
+    digest = hashlib.sha256(repr((kind, args, sorted(kwargs.items()))).encode("utf-8")).hexdigest()
+    job_id = get_job_queue().submit(fn, *args, **kwargs,
+                                    dedupe_key=(st.session_state.session_id, card_id, digest))
+    st.session_state.analysis_jobs.pop(card_id, None)
+    st.session_state.analysis_jobs[card_id] = {
+        "title": title, "kind": kind, "job_id": job_id, "extra": extra,
+        "done": False, "result": None, "error": None, "partial": "", "queue_position": 0,
+        "worker_position": 0,
+    }
+
+# Copy a finished job into its entry (the queue then forgets it); returns
+# True while the job is still running.
+def read_job(entry):
+    if entry["done"]:
+        return False
+    queue = get_job_queue()
+    job = queue.get(entry["job_id"])
+    if job is None:
+        entry.update(done=True, error="This analysis expired; please run it again.")
+        return False
+    if not job.finished:
+        entry.update(partial=job.partial, queue_position=job.queue_position,
+                     worker_position=queue.waiting_position(job))
+        return True
+    entry.update(done=True, result=job.result,
+                 error=str(job.error) if job.error is not None else None)
+    queue.discard(job.id)
+    return False
+
+def show_pending(title, entry):
+    if entry["worker_position"]:
+        st.info(f"⏳ {title}: waiting for a free worker · position {entry['worker_position']}")
+    elif entry["queue_position"]:
+        st.info(f"⏳ {title}: waiting for Gemini quota · position {entry['queue_position']} in queue")
+    elif entry["partial"]:
+        st.markdown(create_response_card(title, entry["partial"]), unsafe_allow_html=True)
     else:
-        st.error("No Job Role Specified")
-        st.error("No job description provided.")
-        st.error("Resume Not Uploaded.")
-        
-
-if submit2:
-    if len(role) > 0:
-        if uploaded_file is not None:
-            text = input_pdf_text(uploaded_file)
-            if len(jd) > 0:
-                with st.spinner('Please Wait..'):
-                    prompt2 = f"""
-                    You are a professional and experienced ATS(Application Tracking System) focused exclusively on the {role} field. Your task is to evaluate the resume strictly based on the provided job description and resume content. It is critical to only identify and list the keywords and phrases that have a direct match between the resume and the JD. Highlight any crucial keywords or skills required for the job that are absent in the resume. Based on your analysis, provide a percentage match.
-
-                    Important: Your analysis must strictly adhere to the content provided below. Do not infer or add any keywords, skills, or technologies not explicitly mentioned in these texts. Re-evaluate the texts to ensure accuracy. Recheck before you provide your response
-
-                    Resume Content: {text}
-                    Job Description: {jd}
-                    
-                    Never provide anything which is neither present in resume content nor job description.
-                    
-                    Output should strictly follow this structure:
-
-                    Percentage Match: [Provide percentage]
-
-                    Matched Keywords:
-                    - Skills: [List only the matched skills found in both the job description and resume content. recheck before you provide your response]
-                    - Technologies: [List only the matched technologies found in both the job description and resume. Recheck before you provide your response]
-                    - Methodologies: [List only the matched methodologies found in both the job description and resume. Recheck before you provide your response]
-
-                    Missing Keywords:
-                    - [List the skills or technologies crucial for the role found in the job description but not in the resume. Recheck before you provide your response]
-
-                    Final Thoughts:
-                    - [Provide a brief assessment focusing on the alignment, matched keywords, missing elements, and percentage match. Reinforce the instruction to only mention elements present in the provided texts. Recheck before you provide your response]
-
-                    
-                    """
-
-                    response = get_gemini_response(prompt2)
-                st.subheader("Percentage Match Analysis")
-                st.write(response)  # Use st.write to display the response
+        st.info(f"🔍 {title}...")
+
+def render_entry(card_id, entry):
+    title, kind = entry["title"], entry["kind"]
+    if kind == "match":
+        # Keyword results are local and shown at once; the model only adds
+        # the closing "Final Thoughts".
+        match = entry["extra"]
+        st.markdown(create_response_card(title, format_match_report(match["result"], entry["result"])),
+                    unsafe_allow_html=True)
+        show_semantic_match(match["semantic"])
+        if not entry["done"]:
+            st.caption("✍️ Writing final thoughts...")
+        elif match["structured"] and not entry["error"]:
+            st.download_button(f"⬇️ {title} (JSON)",
+                               json.dumps(match_data(match["result"], entry["result"]), indent=2),
+                               file_name="match.json", mime="application/json", key="json-match")
+    elif entry["error"]:
+        st.error(f"Error processing {title}: {entry['error']}")
+    elif not entry["done"]:
+        show_pending(title, entry)
+    elif kind == "structured":
+        show_structured_card(card_id, title, *entry["result"])
+    elif kind == "report":
+        for key in FULL_REPORT_KEYS:
+            section_title = ANALYSES[key][0]
+            if key in entry["result"]:
+                st.markdown(create_response_card(section_title, entry["result"][key]),
+                            unsafe_allow_html=True)
             else:
-                st.error("No job description provided.")
-            
-        else:
-            st.error("No job description provided.")
-            st.error("Resume Not Uploaded.")
+                st.warning(f"⚠️ {section_title} was missing from the report; run it on its own.")
     else:
-        st.error("No Job Role Specified")
-        st.error("No job description provided.")
-        st.error("Resume Not Uploaded.")
-
-if submit3:
-    if len(role) > 0:
-        if uploaded_file is not None:
-            text = input_pdf_text(uploaded_file)
-            if len(jd) > 0:
-                with st.spinner('Please Wait..'):
-                    prompt3 = f"""
-                    You are a professional and experienced ATS(Application Tracking System) with a deep understanding of {role} fields. Based on the analysis of the resume and the job description, suggest specific improvements and additions to the candidate's skill set (200-300 words). Identify areas where the candidate falls short and recommend actionable steps or resources for acquiring or enhancing the necessary skills. Highlight the importance of these skills in the context of the targeted job role.
-                    
-                    Here is the resume content : {text}
-                    Here is the job description : {jd}
-                    Your Response Should have the following structure
-                    Example:
-                    
-                    Note: Only Mention and Analyze the content of the provided resume text. Make sure Nothing additional is added outside the provided text 
-                    
-                    Skills Improvement and Addition Suggestions:
-
-                    To further align your resume with the job requirements and the evolving trends in software engineering, consider the following improvements:
+        st.markdown(create_response_card(title, entry["result"]), unsafe_allow_html=True)
+    if kind == "match" and entry["error"]:
+        st.error(f"Error processing request: {entry['error']}")
+
+def render_jobs(polling):
+    pending = False
+    for card_id, entry in list(st.session_state.analysis_jobs.items()):
+        pending |= read_job(entry)
+        render_entry(card_id, entry)
+    if polling and not pending:
+        st.rerun()  # everything has landed: stop polling
 
-                    Expand Knowledge in Emerging Technologies:
-                    - Dive into Machine Learning and Big Data Analytics; consider online courses or projects that demonstrate practical application.
-                    - Familiarize yourself with Blockchain Technology, given its growing impact on secure and decentralized systems.
-                    
-                    Enhance Cloud Computing Skills:
-                    - Gain deeper expertise in cloud services beyond AWS, such as Microsoft Azure or Google Cloud Platform, to showcase versatility.
-                    - Strengthen Soft Skills:
-                    Leadership and project management skills are highly valued; consider leading more projects or taking courses in Agile and Scrum methodologies.
-                    """
+# Handle button actions
+def handle_analysis(key, prompt_template, title, model_name):
+    if validate_inputs():
+        # Only the resume sections this analysis needs are sent.
+        document = parse_pdf(uploaded_file)
+        text = analysis_text(document, key)
+        if structured_output:
+            submit_job(key, title, "structured", structured_analysis, key,
+                       with_skill_hints(json_template(key), document.text, jd),
+                       role, text, jd, refresh=regenerate, model_name=model_name)
+            return
+        # Streamed answers grow in the card as chunks arrive.
+        submit_job(key, title, "text",
+                   cached_gemini_stream if stream_output else cached_gemini_response,
+                   with_skill_hints(prompt_template, document.text, jd),
+                   role, text, jd, refresh=regenerate, model_name=model_name)
+
+# Match Percentage is scored locally; only the final thoughts are a job. Both
+# Full Report modes use it too, so every path shows the same percentage. A JD
+# without any known skill keywords cannot be scored locally and gets the
+# model's Match Percentage analysis instead.
+def submit_match():
+    text = input_pdf_text(uploaded_file)
+    result = score_match(text, jd, role)
+    if result["percentage"] is None:
+        title, prompt_template = ANALYSES["match"]
+        handle_analysis("match", prompt_template, title, analysis_model("match"))
+        return
+    submit_job("match", ANALYSES["match"][0], "match", cached_gemini_response,
+               build_match_thoughts_template(result), role, text, jd,
+               refresh=regenerate, model_name=analysis_model("match"),
+               extra={"result": result, "semantic": semantic_match(text, jd),
+                      "structured": structured_output})
+
+def handle_match():
+    if validate_inputs():
+        submit_match()
 
-                    response = get_gemini_response(prompt3)
-                st.subheader("Skills Improvement Suggestions")
-                st.write(response)
-            else:
-                st.error("No job description provided.")
-        else:
-            st.error("No job description provided.")
-            st.error("Resume Not Uploaded.")
-    else:
-        st.error("No Job Role Specified")
-        st.error("No job description provided.")
-        st.error("Resume Not Uploaded.")
+def run_full_report(role, text, jd, refresh):
+    return split_full_report(cached_gemini_response(
+        with_skill_hints(FULL_REPORT_TEMPLATE, text, jd), role, text, jd, refresh=refresh))
 
-if submit4:
-    if len(role) > 0:
-        if uploaded_file is not None:
-            text = input_pdf_text(uploaded_file)
-            if len(jd) > 0:
-                with st.spinner('Please Wait..'):
-                    prompt4 = f"""
-                    You are a professional and experienced ATS(Application Tracking System) with a deep understanding of {role} fields. Review the resume's bullet points in light of the job description. Provide targeted suggestions on how to edit existing bullet points to better align with the job requirements. Focus on enhancing clarity, relevance, and impact by incorporating keywords from the JD and emphasizing achievements and skills that are most pertinent to the job.
-                    
-                    Here is the resume content : {text}
-                    Here is the job description : {jd}
-                    Your Response Should have the following structure
-                    Example:
-                    
-                    Note: Only Mention and Analyze the content of the provided resume text. Make sure Nothing additional is added outside the provided text 
-                    
-                    Resume Customization Tips for Better Alignment with Job Description:
+# The other four analyses from one request: the resume and JD are sent once
+# and the sectioned answer is split back into the usual cards.
+def handle_full_report():
+    if validate_inputs():
+        submit_match()
+        submit_job("report", "Full Report", "report", run_full_report,
+                   role, input_pdf_text(uploaded_file), jd, regenerate)
 
-                    Tailor Bullet Points:
-                    - Current: "Developed a web application using React and Node.js."
-                    - Revised: "Engineered a scalable web application using React and Node.js, incorporating microservices architecture to enhance modularity and deployability, directly supporting team objectives in agile development environments."
-                    
-                    Highlight Specific Achievements:
-                    - Current: "Designed cloud infrastructure for various projects."
-                    - Revised: "Strategically designed and deployed robust cloud infrastructure on AWS for 3 enterprise-level projects, achieving a 20% improvement in deployment efficiency and cost reduction."
-                    
-                    Incorporate Missing Keywords:
-                    If you have experience with Machine Learning, add a bullet point like: "Implemented machine learning    algorithms to automate data processing tasks, resulting in a 30% reduction in processing times."
-                    """
+# All five analyses as separate jobs running side by side; each card is
+# filled in as soon as its own answer arrives.
+def handle_parallel_report():
+    if validate_inputs():
+        submit_match()
+        document = parse_pdf(uploaded_file)
+        for key in FULL_REPORT_KEYS:
+            title, prompt_template = ANALYSES[key]
+            kind, fn = "text", cached_gemini_response
+            if structured_output:
+                kind, prompt_template = "structured", json_template(key)
+                fn = lambda *args, key=key, **kwargs: structured_analysis(key, *args, **kwargs)
+            submit_job(key, title, kind, fn,
+                       with_skill_hints(prompt_template, document.text, jd),
+                       role, analysis_text(document, key), jd,
+                       refresh=regenerate, model_name=analysis_model(key))
 
-                    response = get_gemini_response(prompt4)
-                st.subheader("Customization Tips")
-                st.write(response)
-            else:
-                st.error("No job description provided.")
+# Process button clicks
+for clicked, key in ((submit1, "summary"), (submit2, "match"), (submit3, "skills"),
+                     (submit4, "customization"), (submit5, "interview")):
+    if clicked:
+        title, prompt_template = ANALYSES[key]
+        if key == "match":
+            handle_match()
         else:
-            st.error("No job description provided.")
-            st.error("Resume Not Uploaded.")
-    else:
-        st.error("No Job Role Specified")
-        st.error("No job description provided.")
-        st.error("Resume Not Uploaded.")
+            handle_analysis(key, prompt_template, title, analysis_model(key))
 
-if submit5:
-    if len(role) > 0:
-        if uploaded_file is not None:
-            text = input_pdf_text(uploaded_file)
-            if len(jd) > 0:
-                with st.spinner('Please Wait..'):
-                    prompt5 = f"""
-                    You are a professional and experienced ATS(Application Tracking System) with a deep understanding of {role} fields. Analyze the provided resume and job description (JD). Generate a set of interview questions and suggested answers tailored to this specific context. The questions should be designed to explore the candidate's technical skills, experiences, and personal attributes relevant to the role, as described in the JD and evidenced in the resume. Provide 5 technical interview questions (1 easy question, 2 medium questions, 3 hard questions) focusing on the key skills and technologies mentioned in the JD and resume. The technical questions should sound specific and technical. Additionally, provide 5 HR interview questions (1 easy question, 2 medium questions, 3 hard questions) that probe into the candidate's behavioral traits, problem-solving abilities, and cultural fit for the organization. For each question, include a detailed sample answer that highlights how the candidate can effectively showcase their relevant skills, experiences, and achievements from their resume in response to the job requirements outlined in the JD."
-
-                    Here is the resume content : {text}
-                    Here is the job description : {jd}
-                    Instructions for Response:
+if submit_all:
+    if report_mode == "Parallel requests":
+        handle_parallel_report()
+    else:
+        handle_full_report()
 
-                    Technical Questions:
-                    Create questions that are directly related to the technical skills and experiences mentioned in the JD and resume.
-                    Ensure questions cover a range of difficulties (easy, medium, hard) and are relevant to real-world scenarios the candidate might face in the role.
-                    
-                    HR Questions:
-                    Formulate questions that assess cultural fit, teamwork, leadership, and resilience.
-                    Questions should invite responses that allow the candidate to demonstrate their problem-solving approach, adaptability, and growth mindset.
-                    
-                    Suggested Answers:
-                    Provide comprehensive sample answers for each question, guiding the candidate on how to integrate their specific experiences and achievements from the resume.
-                    Highlight how each answer can align with the expectations set forth in the JD, showcasing the candidate's suitability for the role.
-                    
-                    Your Response Should have the following structure
-                    
-                    Technical Interview Questions:
-                    
-                    Question1: (Question here)
-                    
-                    Answer1: (Answer here)
-                    
-                    Similarly all other questions.
-                    
-                    HR Interview Questions:
-                    
-                    Question1: (Question here)
-                    
-                    Answer1: (Answer here)
-                    
-                    Similarly all other questions.
-                    """
+# Running and finished analyses; polled while any is still running.
+if st.session_state.analysis_jobs:
+    if st.button("Clear results"):
+        st.session_state.analysis_jobs = {}
+        st.rerun()
+    polling = any(not entry["done"] for entry in st.session_state.analysis_jobs.values())
+    st.fragment(run_every=JOB_POLL_SECONDS if polling else None)(render_jobs)(polling)
 
-                    response = get_gemini_response(prompt5)
-                st.subheader("Interview Preperation Guide ")
-                st.write("Here are some sample Technical and HR interview questions which will help you in answering different questions faced in the interviews.")
-                st.write(response)
-            else:
-                st.error("No job description provided.")
-        else:
-            st.error("No job description provided.")
-            st.error("Resume Not Uploaded.")
-    else:
-        st.error("No Job Role Specified")
-        st.error("No job description provided.")
-        st.error("Resume Not Uploaded.")
 # --------------------------
 # Footer
 # --------------------------
@@ -0,0 +1,67 @@
+import io
+import os
+
+import pybase64
+from PIL import Image
+import streamlit as st
+
+BACKGROUND_MAX_WIDTH = int(os.getenv("BACKGROUND_MAX_WIDTH", 1920))
+BACKGROUND_QUALITY = int(os.getenv("BACKGROUND_QUALITY", 75))
+
+# --------------------------
+# Static asset pipeline
+# --------------------------
+# Background images and stylesheets are read, re-encoded and wrapped in their
+# <style> blocks once per process. The file's mtime is part of every cache key,
+# so editing an asset still takes effect without a restart.
+
+
+@st.cache_data(show_spinner=False)
+def _encode_image(path, mtime, max_width, quality):
+    with Image.open(path) as image:
+        image = image.convert("RGB")
+        if image.width > max_width:
+            image.thumbnail((max_width, max_width * image.height // image.width))
+        buffer = io.BytesIO()
+        try:
+            image.save(buffer, format="WEBP", quality=quality, method=4)
+            mime = "image/webp"
+        except (KeyError, OSError):
+            # Pillow built without WebP support
+            buffer = io.BytesIO()
+            image.save(buffer, format="JPEG", quality=quality, optimize=True)
+            mime = "image/jpeg"
+    return mime, pybase64.b64encode(buffer.getvalue()).decode()
+
+
+@st.cache_data(show_spinner=False)
+def _background_html(path, mtime, overlay):
+    mime, encoded_image = _encode_image(path, mtime, BACKGROUND_MAX_WIDTH, BACKGROUND_QUALITY)
+    image = f'url("data:{mime};base64,{encoded_image}")'
+    if overlay:
+        image = f"linear-gradient({overlay}, {overlay}), {image}"
+    return f"""
+    <style>
+    .stApp {{
+        background: {image};
+        background-size: cover;
+        background-position: center;
+        background-attachment: fixed;
+    }}
+    </style>
+    """
+
+
+@st.cache_data(show_spinner=False)
+def _stylesheet_html(path, mtime):
+    with open(path) as f:
+        return f"<style>{f.read()}</style>"
+
+
+def background_html(image_path, overlay=None):
+    """<style> block setting image_path, downscaled and re-encoded, as the app background."""
+    return _background_html(image_path, os.path.getmtime(image_path), overlay)
+
+
+def stylesheet_html(css_path):
+    return _stylesheet_html(css_path, os.path.getmtime(css_path))
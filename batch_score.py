@@ -0,0 +1,171 @@
+"""Score a directory of resume PDFs against one job description.
+
+    python batch_score.py resumes/ --jd jd.txt --role "Data Analyst" \\
+        --out results.jsonl --csv results.csv --workers 4
+
+With --local the score comes from the in-process keyword scorer instead of
+Gemini: no API calls, deterministic, milliseconds per resume. With
+--structured Gemini answers in JSON and each record carries the validated
+match data (percentage, matched and missing keywords, final thoughts).
+
+Results are appended to the JSONL file as each resume finishes, so an
+interrupted run picks up where it stopped: resumes already scored (same
+file content) are skipped, failed ones are retried.
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from gemini import analysis_model, cached_gemini_response
+from keyword_scorer import format_match_report, score_match
+from pdf_text import file_digest, input_pdf_text, read_pdf_bytes
+from prompts import ANALYSES
+from rate_limiter import BATCH, request_context
+from resume_parser import analysis_text, parse_pdf
+from semantic import semantic_match
+from structured_output import json_template, structured_analysis
+
+_PERCENTAGE_RE = re.compile(r"Percentage Match\W*?(\d+(?:\.\d+)?)\s*%", re.IGNORECASE)
+
+CSV_FIELDS = ("file", "percentage", "semantic", "error")
+
+
+def parse_match_percentage(response):
+    match = _PERCENTAGE_RE.search(response or "")
+    return float(match.group(1)) if match else None
+
+
+def score_resume(path, jd, role, local=False, structured=False):
+    """Run the Match Percentage analysis for one PDF and return a result record."""
+    record = {"file": os.path.basename(path), "role": role}
+    try:
+        data = read_pdf_bytes(path)
+        record["sha256"] = file_digest(data)
+        text = input_pdf_text(data)
+        if local:
+            result = score_match(text, jd, role)
+            # percentage is None when the JD has no recognised skill keywords.
+            record.update(percentage=result["percentage"], matched=result["matched"],
+                          missing=result["missing"], response=format_match_report(result),
+                          semantic=semantic_match(text, jd)["score"], error=None)
+            return record
+        match_text = analysis_text(parse_pdf(data), "match")
+        if structured:
+            match, response = structured_analysis("match", json_template("match"), role,
+                                                 match_text, jd,
+                                                 model_name=analysis_model("match"))
+            record.update(percentage=match["percentage"], structured=match,
+                          response=response, error=None)
+            return record
+        response = cached_gemini_response(ANALYSES["match"][1], role, match_text, jd,
+                                          model_name=analysis_model("match"))
+        record.update(percentage=parse_match_percentage(response), response=response, error=None)
+    except Exception as e:
+        record.update(percentage=None, response=None, error=str(e))
+    return record
+
+
+def _score_in_batch(path, jd, role, local, structured):
+    # Batch calls queue behind interactive app requests for Gemini quota.
+    with request_context(BATCH):
+        return score_resume(path, jd, role, local, structured)
+
+
+def score_resumes(paths, jd, role, workers=4, local=False, structured=False):
+    """Yield a record per PDF in completion order, at most `workers` at a time.
+
+    Resumes are submitted only as workers free up, so stopping the run
+    (Ctrl-C, or closing the generator) leaves the rest unscored instead of
+    paying for results that never reach the JSONL file.
+    """
+    paths = iter(paths)
+    executor = ThreadPoolExecutor(max_workers=workers)
+    running = set()
+    try:
+        while True:
+            for path in paths:
+                running.add(executor.submit(_score_in_batch, path, jd, role, local, structured))
+                if len(running) >= workers:
+                    break
+            if not running:
+                return
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def load_results(out_path):
+    """Latest record per file from a previous run's JSONL output."""
+    results = {}
+    if os.path.exists(out_path):
+        with open(out_path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    record = json.loads(line)
+                    results[record["file"]] = record
+    return results
+
+
+def _already_scored(path, previous):
+    record = previous.get(os.path.basename(path))
+    if not record or record.get("error"):
+        return False
+    return record.get("sha256") == file_digest(read_pdf_bytes(path))
+
+
+def write_csv(results, csv_path):
+    ranked = sorted(results.values(), key=lambda r: r.get("percentage") or -1, reverse=True)
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(ranked)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score resume PDFs against a job description.")
+    parser.add_argument("resume_dir", help="directory containing resume PDFs")
+    parser.add_argument("--jd", required=True, help="text file with the job description")
+    parser.add_argument("--role", required=True, help="job role, e.g. 'Data Analyst'")
+    parser.add_argument("--out", default="results.jsonl", help="JSONL results file (appended)")
+    parser.add_argument("--csv", help="also write a CSV ranked by match percentage")
+    parser.add_argument("--workers", type=int, default=4, help="concurrent Gemini calls")
+    parser.add_argument("--local", action="store_true",
+                        help="score with the local keyword matcher instead of Gemini")
+    parser.add_argument("--structured", action="store_true",
+                        help="ask Gemini for schema-validated JSON match data")
+    args = parser.parse_args(argv)
+
+    with open(args.jd, encoding="utf-8") as f:
+        jd = f.read()
+    paths = sorted(
+        os.path.join(args.resume_dir, name)
+        for name in os.listdir(args.resume_dir)
+        if name.lower().endswith(".pdf")
+    )
+    results = load_results(args.out)
+    pending = [path for path in paths if not _already_scored(path, results)]
+    print(f"{len(paths) - len(pending)} already scored, {len(pending)} to go", file=sys.stderr)
+
+    with open(args.out, "a", encoding="utf-8") as out:
+        records = score_resumes(pending, jd, args.role, args.workers, args.local, args.structured)
+        for done, record in enumerate(records, start=1):
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+            results[record["file"]] = record
+            status = record["error"] or f"{record['percentage']}%"
+            print(f"[{done}/{len(pending)}] {record['file']}: {status}", file=sys.stderr)
+
+    if args.csv:
+        write_csv(results, args.csv)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
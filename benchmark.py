@@ -0,0 +1,337 @@
+"""Benchmark the analysis pipeline without the network.
+
+    python benchmark.py --out bench_output.txt
+    python benchmark.py --baseline old_bench.txt --threshold 0.2
+
+Gemini is replaced by a stub model with a fixed latency and canned answers,
+and resumes are synthetic PDFs of 1 to 20 pages, so the numbers measure our
+own code: PDF extraction, prompt building, local scoring, response-cache
+hit and miss paths, Mongo job-role writes and rendering (card builders and
+Streamlit reruns of app.py through AppTest).
+
+Mongo writes run against --mongo-uri (a local mongod) or mongomock if it is
+installed, and are reported as skipped otherwise. The report is JSON; with
+--baseline, benchmarks whose median is slower than the baseline's by more
+than --threshold are listed and the exit status is 1.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+import gemini
+from compaction import compact_resume
+from fanout import run_concurrently
+from job_role_writer import JobRoleWriter
+from keyword_scorer import format_match_report, score_match
+from pdf_text import clear_text_cache, extract_pdf_text, input_pdf_text
+from prompts import ANALYSES, with_skill_hints
+from rate_limiter import Scheduler
+from response_cache import ResponseCache
+from resume_parser import analysis_text, parse_resume
+from semantic import semantic_match
+from structured_output import json_template, parse_structured, render_markdown, structured_analysis
+
+PAGE_COUNTS = (1, 5, 20)
+
+JD = """We are hiring a Data Analyst to build dashboards and reporting pipelines.
+Requirements: 3+ years with SQL and Python, experience with Tableau or Power BI,
+statistics, A/B testing, stakeholder communication and Agile delivery.
+Nice to have: AWS, Airflow, dbt, machine learning basics."""
+
+_SKILLS = ["Python", "SQL", "Tableau", "Power BI", "Excel", "AWS", "Airflow", "dbt", "Spark",
+           "pandas", "A/B testing", "statistics", "Agile", "Scrum", "Docker", "Git"]
+_VERBS = ["Built", "Automated", "Designed", "Led", "Migrated", "Analysed", "Improved", "Delivered"]
+_OBJECTS = ["weekly revenue dashboards", "an ETL pipeline", "churn models", "KPI reports",
+            "a forecasting service", "data quality checks", "experiment readouts"]
+_HEADINGS = ["SUMMARY", "EXPERIENCE", "PROJECTS", "SKILLS", "EDUCATION", "CERTIFICATIONS"]
+
+
+# --------------------------
+# Synthetic resumes
+# --------------------------
+def _resume_lines(rng, count):
+    lines = []
+    while len(lines) < count:
+        lines.append(rng.choice(_HEADINGS))
+        for _ in range(rng.randint(4, 9)):
+            lines.append(f"- {rng.choice(_VERBS)} {rng.choice(_OBJECTS)} with "
+                         f"{rng.choice(_SKILLS)} and {rng.choice(_SKILLS)}, saving {rng.randint(2, 40)}%")
+    return lines[:count]
+
+
+def synthetic_pdf(pages, lines_per_page=45, seed=0):
+    """Bytes of a text PDF with a repeated header/footer on every page."""
+    rng = random.Random(seed)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once the page objects are numbered
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for page in range(pages):
+        lines = ["Jane Doe | jane.doe@example.com | +1 555 0100"]
+        lines += _resume_lines(rng, lines_per_page)
+        lines.append(f"Page {page + 1} of {pages}")
+        text = " T* ".join(
+            "({})".format(line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")) + " Tj"
+            for line in lines
+        )
+        stream = f"BT /F1 10 Tf 14 TL 50 760 Td {text} ET".encode("latin-1")
+        page_number, content_number = len(objects) + 1, len(objects) + 2
+        kids.append(f"{page_number} 0 R")
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_number
+        )
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {pages} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+# --------------------------
+# Stub LLM
+# --------------------------
+STUB_MATCH_JSON = json.dumps({
+    "percentage": 72,
+    "matched": {"Skills": ["statistics"], "Technologies": ["Python", "SQL"], "Methodologies": ["Agile"]},
+    "missing": ["dbt"],
+    "final_thoughts": ["Strong SQL and Python coverage."],
+})
+
+
+class _StubResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class StubModel:
+    """Stands in for genai.GenerativeModel: fixed latency, canned answers."""
+
+    def __init__(self, latency, chunks=8):
+        self.latency = latency
+        self.chunks = chunks
+        self.calls = 0
+
+    def generate_content(self, prompt, stream=False, generation_config=None):
+        self.calls += 1
+        text = STUB_MATCH_JSON if generation_config else "Overview:\nA canned analysis.\n" * 20
+        if not stream:
+            time.sleep(self.latency)
+            return _StubResponse(text)
+        size = -(-len(text) // self.chunks)
+
+        def chunks():
+            for start in range(0, len(text), size):
+                time.sleep(self.latency / self.chunks)
+                yield _StubResponse(text[start:start + size])
+        return chunks()
+
+
+# --------------------------
+# Measurement
+# --------------------------
+def measure(name, fn, runs, group):
+    """Time fn() runs times; fn may take the run index."""
+    timings = []
+    for i in range(runs):
+        started = time.perf_counter()
+        fn(i)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {
+        "name": name,
+        "group": group,
+        "runs": runs,
+        "mean_ms": round(statistics.fmean(timings), 4),
+        "p50_ms": round(timings[len(timings) // 2], 4),
+        "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 4),
+        "min_ms": round(timings[0], 4),
+    }
+
+
+def bench_extraction(pdfs, runs):
+    results = []
+    for pages, data in pdfs.items():
+        results.append(measure(f"extract_pdf_text[{pages}p]",
+                               lambda i: extract_pdf_text(data), runs, "extraction"))
+        clear_text_cache()
+        input_pdf_text(data)
+        results.append(measure(f"input_pdf_text_cached[{pages}p]",
+                               lambda i: input_pdf_text(data), runs * 10, "extraction"))
+    return results
+
+
+def bench_prompts(texts, runs):
+    results = []
+    template = ANALYSES["skills"][1]
+    for pages, text in texts.items():
+        results.append(measure(f"compact_resume[{pages}p]",
+                               lambda i: compact_resume.__wrapped__(text), runs, "prompt"))
+        results.append(measure(f"parse_resume[{pages}p]", lambda i: parse_resume(text), runs, "prompt"))
+        results.append(measure(
+            f"build_prompt[{pages}p]",
+            lambda i: with_skill_hints(template, text, JD).format(
+                role="Data Analyst", text=analysis_text(parse_resume(text), "skills"), jd=JD),
+            runs, "prompt"))
+        results.append(measure(f"score_match[{pages}p]", lambda i: score_match(text, JD), runs, "scoring"))
+        results.append(measure(f"semantic_match[{pages}p]", lambda i: semantic_match(text, JD), runs, "scoring"))
+    return results
+
+
+def bench_llm_paths(text, runs, stub):
+    template = ANALYSES["summary"][1]
+    role = "Data Analyst"
+    gemini.cached_gemini_response(template, role, text, JD)
+    results = [
+        measure("gemini_cache_miss", lambda i: gemini.cached_gemini_response(
+            template, f"{role} {i}", text, JD), runs, "llm"),
+        measure("gemini_cache_hit", lambda i: gemini.cached_gemini_response(
+            template, role, text, JD), runs * 10, "llm"),
+        measure("gemini_stream_miss", lambda i: "".join(gemini.cached_gemini_stream(
+            template, f"{role} stream {i}", text, JD)), runs, "llm"),
+        measure("parallel_report_miss", lambda i: list(run_concurrently(
+            lambda prompt_template: gemini.cached_gemini_response(
+                prompt_template, f"{role} parallel {i}", text, JD),
+            {key: prompt_template for key, (_, prompt_template) in ANALYSES.items()})), runs, "llm"),
+        measure("structured_match_miss", lambda i: structured_analysis(
+            "match", json_template("match"), f"{role} json {i}", text, JD), runs, "llm"),
+        measure("parse_structured", lambda i: parse_structured("match", STUB_MATCH_JSON),
+                runs * 10, "llm"),
+    ]
+    results.append({"name": "stub_calls", "group": "llm", "count": stub.calls})
+    return results
+
+
+def _mongo_collection(uri):
+    if uri:
+        from pymongo import MongoClient
+        return MongoClient(uri, serverSelectionTimeoutMS=3000)["bench"]["collect_job_role"]
+    try:
+        import mongomock
+    except ImportError:
+        return None
+    return mongomock.MongoClient()["bench"]["collect_job_role"]
+
+
+def bench_mongo(uri, runs, batch=200):
+    collection = _mongo_collection(uri)
+    if collection is None:
+        return [{"name": "job_role_flush", "group": "mongo",
+                 "skipped": "no --mongo-uri and mongomock is not installed"}]
+    collection.delete_many({})
+    writer = JobRoleWriter(lambda: collection, flush_seconds=3600, batch_size=10 ** 9)
+
+    def flush_batch(i):
+        for n in range(batch):
+            writer.submit(f"bench-{i}", f"role {n}")
+        writer.flush()
+
+    result = measure(f"job_role_flush[{batch}]", flush_batch, runs, "mongo")
+    result["per_doc_ms"] = round(result["mean_ms"] / batch, 4)
+    collection.delete_many({})
+    return [result]
+
+
+def bench_rendering(text, runs, app):
+    result = score_match(text, JD)
+    data = parse_structured("match", STUB_MATCH_JSON)
+    results = [
+        measure("format_match_report", lambda i: format_match_report(result), runs * 10, "render"),
+        measure("render_markdown[match]", lambda i: render_markdown("match", data), runs * 10, "render"),
+    ]
+    if app:
+        from streamlit.testing.v1 import AppTest
+        app_test = AppTest.from_file("app.py", default_timeout=60)
+        results.append(measure("app_rerun_cold", lambda i: app_test.run(), 1, "render"))
+        results.append(measure("app_rerun_warm", lambda i: app_test.run(), runs, "render"))
+    return results
+
+
+def compare(report, baseline, threshold):
+    """Benchmarks whose median regressed by more than threshold (a fraction)."""
+    previous = {r["name"]: r for r in baseline.get("results", []) if "p50_ms" in r}
+    regressions = []
+    for result in report["results"]:
+        before = previous.get(result["name"])
+        if before and "p50_ms" in result and before["p50_ms"] > 0:
+            change = result["p50_ms"] / before["p50_ms"] - 1
+            if change > threshold:
+                regressions.append({"name": result["name"], "before_ms": before["p50_ms"],
+                                    "after_ms": result["p50_ms"], "change": round(change, 3)})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the analysis pipeline with a stub LLM.")
+    parser.add_argument("--out", default="bench_output.txt", help="JSON report path")
+    parser.add_argument("--runs", type=int, default=20, help="runs per benchmark")
+    parser.add_argument("--latency", type=float, default=0.05, help="stub LLM latency in seconds")
+    parser.add_argument("--mongo-uri", help="local mongod for the job-role write benchmark")
+    parser.add_argument("--skip-app", action="store_true", help="skip the AppTest reruns of app.py")
+    parser.add_argument("--baseline", help="previous report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="slowdown vs. baseline reported as a regression (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    stub = StubModel(args.latency)
+    gemini.get_model = lambda model_name=gemini.DEFAULT_MODEL: stub
+    # No quota to respect; the scheduler's own overhead stays in the numbers.
+    unlimited = Scheduler(rpm=6e7, burst=10 ** 6)
+    gemini.get_scheduler = lambda model_name: unlimited
+    with tempfile.TemporaryDirectory() as tmp:
+        gemini.response_cache = ResponseCache(os.path.join(tmp, "responses.sqlite3"))
+        pdfs = {pages: synthetic_pdf(pages, seed=pages) for pages in PAGE_COUNTS}
+        texts = {pages: extract_pdf_text(data) for pages, data in pdfs.items()}
+        started = time.perf_counter()
+        results = (bench_extraction(pdfs, args.runs)
+                   + bench_prompts(texts, args.runs)
+                   + bench_llm_paths(texts[PAGE_COUNTS[1]], args.runs, stub)
+                   + bench_mongo(args.mongo_uri, args.runs)
+                   + bench_rendering(texts[PAGE_COUNTS[1]], args.runs, not args.skip_app))
+
+    report = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {"runs": args.runs, "stub_latency_s": args.latency, "page_counts": PAGE_COUNTS},
+        "total_s": round(time.perf_counter() - started, 3),
+        "results": results,
+    }
+    status = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            report["regressions"] = compare(report, json.load(f), args.threshold)
+        status = 1 if report["regressions"] else 0
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    for result in results:
+        timing = f"{result['mean_ms']:10.3f} ms (p95 {result['p95_ms']:.3f})" if "mean_ms" in result \
+            else result.get("skipped") or result.get("count")
+        print(f"{result['name']:<32} {timing}", file=sys.stderr)
+    for regression in report.get("regressions", []):
+        print(f"REGRESSION {regression['name']}: {regression['before_ms']} -> "
+              f"{regression['after_ms']} ms ({regression['change']:+.0%})", file=sys.stderr)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
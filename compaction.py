@@ -0,0 +1,167 @@
+import os
+import re
+from collections import Counter
+from functools import lru_cache
+
+# --------------------------
+# Prompt compaction
+# --------------------------
+# Extracted resume text is full of layout noise: runs of spaces, blank lines,
+# the same header/footer on every page, repeated lines. It is cleaned up
+# before it goes into a prompt and then trimmed to a token budget, dropping
+# the least useful sections first. Budgets are approximate (characters / 4);
+# 0 disables trimming.
+RESUME_TOKEN_BUDGET = int(os.getenv("PROMPT_RESUME_TOKENS", 3000))
+JD_TOKEN_BUDGET = int(os.getenv("PROMPT_JD_TOKENS", 1500))
+CHARS_PER_TOKEN = 4
+
+PAGE_BREAK = "\f"
+# Lines this short are kept even when repeated ("Python" under two headings).
+MIN_DEDUPE_CHARS = 20
+HEADER_FOOTER_LINES = 2
+
+_SPACE_RE = re.compile(r"[^\S\n\f]+")
+_PAGE_NUMBER_RE = re.compile(r"^(?:page\s*)?[-–]?\s*\d+\s*(?:(?:of|/)\s*\d+)?\s*[-–]?$", re.IGNORECASE)
+_DIGITS_RE = re.compile(r"\d+")
+
+# heading text -> canonical section; the preamble before any heading is "Header"
+SECTION_HEADINGS = {
+    "summary": "Summary", "professional summary": "Summary", "profile": "Summary",
+    "objective": "Summary", "career objective": "Summary", "about me": "Summary",
+    "experience": "Experience", "work experience": "Experience",
+    "professional experience": "Experience", "employment history": "Experience",
+    "work history": "Experience", "internships": "Experience", "internship": "Experience",
+    "education": "Education", "academic background": "Education", "qualifications": "Education",
+    "skills": "Skills", "technical skills": "Skills", "key skills": "Skills",
+    "core competencies": "Skills", "technologies": "Skills",
+    "projects": "Projects", "academic projects": "Projects", "personal projects": "Projects",
+    "certifications": "Certifications", "certificates": "Certifications", "courses": "Certifications",
+    "achievements": "Achievements", "awards": "Achievements", "publications": "Achievements",
+}
+
+# Sections in the order they keep their lines when the budget runs short.
+SECTION_PRIORITY = ("Header", "Summary", "Skills", "Experience", "Projects",
+                    "Certifications", "Education", "Achievements")
+
+
+def estimate_tokens(text):
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def _line_key(line):
+    return _SPACE_RE.sub(" ", line).strip().lower()
+
+
+def _normalize_lines(page):
+    lines = (_SPACE_RE.sub(" ", line.replace(" ", " ")).strip() for line in page.split("\n"))
+    return [line for line in lines if line]
+
+
+def strip_page_furniture(pages):
+    """Drop page numbers and header/footer lines repeated across pages.
+
+    A line counts as a header or footer when it is among the first or last
+    HEADER_FOOTER_LINES of at least half the pages (digits ignored, so
+    "Page 2 of 3" matches across pages). The first page keeps its header,
+    which is usually the candidate's name and contact line.
+    """
+    def edges(lines):
+        return lines[:HEADER_FOOTER_LINES] + lines[-HEADER_FOOTER_LINES:]
+
+    repeated = set()
+    if len(pages) > 1:
+        counts = Counter(
+            key for lines in pages
+            for key in {_DIGITS_RE.sub("#", _line_key(line)) for line in edges(lines)}
+        )
+        repeated = {key for key, count in counts.items() if count >= max(2, len(pages) / 2)}
+    return [
+        [line for i, line in enumerate(lines)
+         if not _PAGE_NUMBER_RE.match(line)
+         and not ((0 < page_number and i < HEADER_FOOTER_LINES
+                   or i >= len(lines) - HEADER_FOOTER_LINES)
+                  and _DIGITS_RE.sub("#", _line_key(line)) in repeated)]
+        for page_number, lines in enumerate(pages)
+    ]
+
+
+def dedupe_lines(lines):
+    seen = set()
+    kept = []
+    for line in lines:
+        key = _line_key(line)
+        if len(key) >= MIN_DEDUPE_CHARS:
+            if key in seen:
+                continue
+            seen.add(key)
+        kept.append(line)
+    return kept
+
+
+def section_of(line):
+    """Canonical section name if line is a section heading, else None."""
+    key = _line_key(line).strip(" :-–|")
+    if len(key.split()) > 4:
+        return None
+    return SECTION_HEADINGS.get(key)
+
+
+def split_sections(lines):
+    """[(section name, [lines])] in document order, headings included."""
+    sections = [("Header", [])]
+    for line in lines:
+        name = section_of(line)
+        if name is not None:
+            sections.append((name, [line]))
+        else:
+            sections[-1][1].append(line)
+    return [(name, body) for name, body in sections if body]
+
+
+def trim_sections(sections, budget):
+    """Keep as many lines as fit in budget tokens, by SECTION_PRIORITY.
+
+    Each section keeps its leading lines; sections are emitted in their
+    original order, and one that keeps nothing but its heading is dropped.
+    """
+    remaining = budget * CHARS_PER_TOKEN
+    kept = {}
+    rank = {name: i for i, name in enumerate(SECTION_PRIORITY)}
+    for index in sorted(range(len(sections)), key=lambda i: rank.get(sections[i][0], len(rank))):
+        name, body = sections[index]
+        lines = []
+        for line in body:
+            if len(line) + 1 > remaining:
+                break
+            lines.append(line)
+            remaining -= len(line) + 1
+        heading_only = section_of(body[0]) is not None and len(lines) <= 1
+        if lines and not heading_only:
+            kept[index] = lines
+        elif lines:
+            remaining += len(lines[0]) + 1
+    return [line for index in sorted(kept) for line in kept[index]]
+
+
+def clean_lines(text):
+    """Non-empty resume lines with page furniture and repeated lines removed."""
+    pages = strip_page_furniture([_normalize_lines(page) for page in text.split(PAGE_BREAK)])
+    return dedupe_lines([line for page in pages for line in page])
+
+
+@lru_cache(maxsize=256)
+def compact_resume(text, budget=RESUME_TOKEN_BUDGET):
+    """Resume text cleaned for a prompt and trimmed to about budget tokens."""
+    lines = clean_lines(text)
+    if budget and estimate_tokens("\n".join(lines)) > budget:
+        lines = trim_sections(split_sections(lines), budget)
+    return "\n".join(lines)
+
+
+@lru_cache(maxsize=256)
+def compact_jd(jd, budget=JD_TOKEN_BUDGET):
+    """Job description with whitespace normalised, repeats dropped, cut to budget."""
+    compacted = "\n".join(dedupe_lines(_normalize_lines(jd.replace(PAGE_BREAK, "\n"))))
+    if budget and estimate_tokens(compacted) > budget:
+        compacted = compacted[:budget * CHARS_PER_TOKEN].rsplit("\n", 1)[0]
+    return compacted
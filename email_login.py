@@ -1,11 +1,10 @@
 import streamlit as st
-import requests
+import otp_client
+from otp_client import OtpServiceUnavailable
 import time
 
-# Define the endpoints
-SUBSCRIBE_ENDPOINT = "http://45.79.121.132:8001/SubscribeAndFeedback/Otpgenerate/"
-OTP_VERIFICATION_ENDPOINT = "http://45.79.121.132:8001/SubscribeAndFeedback/OtpVerfication/"
-EMAIL_VERIFICATION_ENDPOINT = "http://45.79.121.132:8001/SubscribeAndFeedback/EmailVerification/"
+# Endpoints, timeouts and retries live in otp_client
+OTP_UNAVAILABLE_MESSAGE = "The OTP service is not responding. Please try again shortly."
 
 # Initialize session state
 if 'logged_in' not in st.session_state:
@@ -23,13 +22,13 @@ if 'email_exists' not in st.session_state:
 
 # Function to subscribe and generate OTP
 def subscribe(email):
-    api = SUBSCRIBE_ENDPOINT
-    headers = {'Content-Type': 'application/json'}
-    mail = {"emailid": email}
-    r = requests.post(api, json=mail, headers=headers)
-    data = r.json()
+    try:
+        sent = otp_client.request_otp(email)
+    except OtpServiceUnavailable:
+        st.error(OTP_UNAVAILABLE_MESSAGE)
+        return
     
-    if data.get("Status") == 200:
+    if sent:
         st.session_state.otp_sent = True
         st.session_state.otp_message = True
         st.success(f"OTP sent successfully to {email}")
@@ -41,23 +40,19 @@ def subscribe(email):
 
 # Function to verify OTP
 def verify_otp(email, otp):
-    api = OTP_VERIFICATION_ENDPOINT
-    headers = {'Content-Type': 'application/json'}
-    data = {"emailid": email, "otp": otp}
-    r = requests.post(api, json=data, headers=headers)
-    response = r.json()
-    
-    return response.get("Status") == 200
+    try:
+        return otp_client.verify_otp(email, otp)
+    except OtpServiceUnavailable:
+        st.error(OTP_UNAVAILABLE_MESSAGE)
+        return False
 
 # Function to verify if email exists
 def check_email_exists(email):
-    api = EMAIL_VERIFICATION_ENDPOINT
-    headers = {'Content-Type': 'application/json'}
-    data = {"emailid": email}
-    r = requests.post(api, json=data, headers=headers)
-    response = r.json()
-    
-    return response.get("Status") == 200
+    try:
+        return otp_client.check_email_exists(email)
+    except OtpServiceUnavailable:
+        st.error(OTP_UNAVAILABLE_MESSAGE)
+        return False
 
 # Streamlit UI
 st.title("Unlock Free Access to IntelliMatch-AI-ATS!")
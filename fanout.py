@@ -0,0 +1,28 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# --------------------------
+# Concurrent prompt dispatch
+# --------------------------
+# Gemini calls are network bound, so one process-wide thread pool lets every
+# session send its prompts side by side. Streamlit calls stay on the script
+# thread: workers only run the LLM function, the caller renders the results.
+FANOUT_WORKERS = int(os.getenv("GEMINI_FANOUT_WORKERS", 10))
+
+_executor = ThreadPoolExecutor(max_workers=FANOUT_WORKERS,
+                               thread_name_prefix="gemini-fanout")
+
+
+def run_concurrently(fn, prompts):
+    """Call fn(prompt) for every {key: prompt} at once.
+
+    Yields (key, result, error) in completion order, so the caller can show
+    each result as soon as it lands instead of waiting for the slowest one.
+    """
+    futures = {_executor.submit(fn, prompt): key for key, prompt in prompts.items()}
+    for future in as_completed(futures):
+        key = futures[future]
+        try:
+            yield key, future.result(), None
+        except Exception as e:
+            yield key, None, e
@@ -1,32 +1,36 @@
 import streamlit as st
-import requests
+import otp_client
+from otp_client import OtpServiceUnavailable
+import uuid
 import time
 
-import pybase64
 import io
 from dotenv import load_dotenv
 
-import pymongo
 from pymongo import MongoClient
-import os 
 
 import streamlit as st
-import os
 from PIL import Image
-import PyPDF2 as pdf
-import google.generativeai as genai
+from assets import background_html, stylesheet_html
+from pdf_text import input_pdf_text
+from resume_parser import analysis_text, parse_pdf
+from jobs import get_job_queue
+from history_store import HISTORY_PAGE_SIZE, get_analysis_history, input_key
+from gemini import analysis_model, cached_gemini_stream, response_cache
+from keyword_scorer import format_match_report, score_match
+from prompts import ANALYSES, build_match_thoughts_template, with_skill_hints
 import time
-from database import x
+from job_role_writer import get_job_role_writer
 import webbrowser
 
-# Define the endpoints
-SUBSCRIBE_ENDPOINT = "http://45.79.121.132:8001/SubscribeAndFeedback/Otpgenerate/"
-OTP_VERIFICATION_ENDPOINT = "http://45.79.121.132:8001/SubscribeAndFeedback/OtpVerfication/"
-EMAIL_VERIFICATION_ENDPOINT = "http://45.79.121.132:8001/SubscribeAndFeedback/EmailVerification/"
+# Endpoints, timeouts and retries live in otp_client
+OTP_UNAVAILABLE_MESSAGE = "The OTP service is not responding. Please try again shortly."
 
 # Initialize session state
 if 'logged_in' not in st.session_state:
     st.session_state.logged_in = False
+if 'session_id' not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
 if 'email' not in st.session_state:
     st.session_state.email = ""
 if 'otp_sent' not in st.session_state:
@@ -40,19 +44,27 @@ if 'email_exists' not in st.session_state:
 
 # Function to subscribe and generate OTP
 def subscribe(email):
-    response = requests.post(SUBSCRIBE_ENDPOINT, json={"emailid": email}, headers={'Content-Type': 'application/json'})
-    data = response.json()
-    return data.get("Status") == 200
+    try:
+        return otp_client.request_otp(email)
+    except OtpServiceUnavailable:
+        st.error(OTP_UNAVAILABLE_MESSAGE)
+        return False
 
 # Function to verify OTP
 def verify_otp(email, otp):
-    response = requests.post(OTP_VERIFICATION_ENDPOINT, json={"emailid": email, "otp": otp}, headers={'Content-Type': 'application/json'})
-    return response.json().get("Status") == 200
+    try:
+        return otp_client.verify_otp(email, otp)
+    except OtpServiceUnavailable:
+        st.error(OTP_UNAVAILABLE_MESSAGE)
+        return False
 
 # Function to verify if email exists
 def check_email_exists(email):
-    response = requests.post(EMAIL_VERIFICATION_ENDPOINT, json={"emailid": email}, headers={'Content-Type': 'application/json'})
-    return response.json().get("Status") == 200
+    try:
+        return otp_client.check_email_exists(email)
+    except OtpServiceUnavailable:
+        st.error(OTP_UNAVAILABLE_MESSAGE)
+        return False
 
 
 # Streamlit UI
@@ -91,40 +103,11 @@ else:
     st.success("You are already logged in.")
     load_dotenv()
 
-    username = x['default']
-    try:
-        y=x['default']['CLIENT']
-        myclient = pymongo.MongoClient(f"mongodb://{username['CLIENT']['username']}:{username['CLIENT']['password']}@{username['CLIENT']['host']}:27017/")
-        print(myclient)
-        
-    except:
-        myclient = pymongo.MongoClient("mongodb://localhost:27017/")
-        print(myclient)
-        
-
-    mydb = myclient["lifeeazydb_prod"]
-    collection = mydb["collect_job_role"]
-
-
-    genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
-
-    def get_gemini_response(input):
-        model = genai.GenerativeModel('gemini-2.0-flash')
-        response = model.generate_content(input)
-        return response.text
-
-    def input_pdf_text(uploaded_file):
-        reader = pdf.PdfReader(uploaded_file)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text() or ''  # Ensure text is not None
-        return text
 
     ## ------- Streamlit app setup ---------
     st.set_page_config(page_title="ATSPro", page_icon="📑", layout = 'wide')
 
-    with open( "styles/main.css" ) as css:
-        st.markdown( f'<style>{css.read()}</style>' , unsafe_allow_html= True)
+    st.markdown(stylesheet_html("styles/main.css"), unsafe_allow_html=True)
 
 
     custom_sidebar_style = """
@@ -237,22 +220,8 @@ else:
     #Set BAckground Image
 
     def set_bg_image(image_file):
-        with open(image_file, "rb") as file:
-            # Use base64 to encode the image file
-            encoded_image = pybase64.b64encode(file.read()).decode()
-
-        # Set the background using CSS styles
-        css_style = f"""
-        <style>
-        .stApp {{
-            background-image: url("data:image/png;base64,{encoded_image}");
-            background-size: cover;
-            background-position: center;
-        }}
-        </style>
-        """
-
-        st.markdown(css_style, unsafe_allow_html=True)
+        # Resized, re-encoded and memoized once per process
+        st.markdown(background_html(image_file), unsafe_allow_html=True)
 
     set_bg_image("background.JPG")
 
@@ -266,9 +235,8 @@ else:
 
     if role != '':
         st.write(f":black[You entered **{role}** as your role.]")
-        # Save the job role to the MongoDB collection
-        job_role_data = {'role_name': role}
-        collection.insert_one(job_role_data)
+        # Save the job role to MongoDB (deduplicated per session, written in batches)
+        get_job_role_writer().submit(st.session_state.session_id, role)
         st.success(f"Job Role '{role}' saved successfully!")
     # else:
     #     st.write("Enter a Job Role")
@@ -351,132 +319,62 @@ else:
         submit5 = st.button("Interview Prep Guide", key="submit5", on_click=on_submit5_clicked, type="primary")
 
 
-    # Process button clicks
-    if submit1 and st.session_state['submit1_clicked']:
-        if len(role) > 0:
-            if uploaded_file is not None:
-                text = input_pdf_text(uploaded_file)
-                if len(jd) > 0:
-                    with st.spinner('Please Wait..'):
-                        prompt1 = f"""
-                        You are a professional and experienced ATS(Application Tracking System) with a deep understanding of {role} fields. Analyze the provided resume and job description (JD). Provide a detailed analysis (200-300 words) of how the resume aligns with the JD, highlighting key areas of strength, relevant experiences, and qualifications. Discuss any notable achievements or skills that are particularly well-matched to the job requirements.
-                        
-                        Here is the resume content : {text}
-                        Here is the job description : {jd}
-                        Your Response Should have the following structure
-                        Example:
-                        
-                        Note: Only Mention and Analyze the content of the provided resume text. Make sure Nothing additional is added outside the provided text 
-                        
-                        Resume Analysis and Alignment with Job Description:
-
-                        Overview: 
-                        The resume presents a strong background in software engineering, with a particular emphasis on full-stack development and cloud technologies.
-                        
-                        Strengths:
-                        - Technical Proficiency: Proficient in key programming languages such as Python, JavaScript, and Java, aligning well with the job's technical requirements.
-                        - Project Experience: Showcases several projects that demonstrate the ability to design, develop, and deploy scalable software solutions, mirroring the JD's emphasis on hands-on experience.
-                        
-                        Relevant Experiences: (Highlight only the things that are present in the resume.)
-                        - Lead Developer Role: Led a team in developing a SaaS application using microservices architecture, directly relevant to the job's focus on leadership and microservices.
-                        - Cloud Solutions Architect: Experience in designing cloud infrastructure on AWS, aligning with the JD's requirement for cloud computing skills.
-                        
-                        """
-
-                        response = get_gemini_response(prompt1)
-                    st.write(response)  # Use st.write to display the response
-                else:
-                    st.error("No job description provided.")
-                
-            else:
-                st.error("No job description provided.")
-                st.error("Resume Not Uploaded.")
-        else:
-            st.error("No Job Role Specified")
-            st.error("No job description provided.")
-            st.error("Resume Not Uploaded.")  
-
-    if submit2 and st.session_state['submit2_clicked']:
-        if len(role) > 0:
-            if uploaded_file is not None:
-                text = input_pdf_text(uploaded_file)
-                if len(jd) > 0:
-                    with st.spinner('Please Wait..'):
-                        prompt2 = f"""
-                        You are a professional and experienced ATS(Application Tracking System) focused exclusively on the {role} field. Your task is to evaluate the resume strictly based on the provided job description and resume content. It is critical to only identify and list the keywords and phrases that have a direct match between the resume and the JD. Highlight any crucial keywords or skills required for the job that are absent in the resume. Based on your analysis, provide a percentage match.
-
-                        Important: Your analysis must strictly adhere to the content provided below. Do not infer or add any keywords, skills, or technologies not explicitly mentioned in these texts. Re-evaluate the texts to ensure accuracy. Recheck before you provide your response
-
-                        Resume Content: {text}
-                        Job Description: {jd}
-                        
-                        Never provide anything which is neither present in resume content nor job description.
-                        
-                        Output should strictly follow this structure:
+    regenerate = st.checkbox("Regenerate (ignore saved answers)")
+    cache_stats = response_cache.stats()
+    st.sidebar.caption(f"Response cache: {cache_stats['hits']} hits · "
+                       f"{cache_stats['misses']} misses · {cache_stats['entries']} saved")
 
-                        Percentage Match: [Provide percentage]
 
-                        Matched Keywords:
-                        - Skills: [List only the matched skills found in both the job description and resume content. recheck before you provide your response]
-                        - Technologies: [List only the matched technologies found in both the job description and resume. Recheck before you provide your response]
-                        - Methodologies: [List only the matched methodologies found in both the job description and resume. Recheck before you provide your response]
+    # Analyses run as background jobs (jobs.py); their ids and results live in
+    # st.session_state.analysis_jobs, so a rerun (e.g. editing the role) keeps
+    # them going and keeps showing them.
+    if 'analysis_jobs' not in st.session_state:
+        st.session_state['analysis_jobs'] = {}
 
-                        Missing Keywords:
-                        - [List the skills or technologies crucial for the role found in the job description but not in the resume. Recheck before you provide your response]
-
-                        Final Thoughts:
-                        - [Provide a brief assessment focusing on the alignment, matched keywords, missing elements, and percentage match. Reinforce the instruction to only mention elements present in the provided texts. Recheck before you provide your response]
-
-                        
-                        """
-
-                        response = get_gemini_response(prompt2)
-                    st.subheader("Percentage Match Analysis")
-                    st.write(response)  # Use st.write to display the response
-                else:
-                    st.error("No job description provided.")
-                
-            else:
-                st.error("No job description provided.")
-                st.error("Resume Not Uploaded.")
-        else:
-            st.error("No Job Role Specified")
-            st.error("No job description provided.")
-            st.error("Resume Not Uploaded.")
+    # Finished analyses are also kept in the history store, per user, keyed by
+    # role, resume and JD: asking again for the same inputs is answered from it.
+    history = get_analysis_history()
+    history_owner = st.session_state.email or st.session_state.session_id
 
-    if submit3 and st.session_state['submit3_clicked']:
+    def run_analysis(key):
+        title, prompt_template = ANALYSES[key]
         if len(role) > 0:
             if uploaded_file is not None:
                 text = input_pdf_text(uploaded_file)
                 if len(jd) > 0:
-                    with st.spinner('Please Wait..'):
-                        prompt3 = f"""
-                        You are a professional and experienced ATS(Application Tracking System) with a deep understanding of {role} fields. Based on the analysis of the resume and the job description, suggest specific improvements and additions to the candidate's skill set (200-300 words). Identify areas where the candidate falls short and recommend actionable steps or resources for acquiring or enhancing the necessary skills. Highlight the importance of these skills in the context of the targeted job role.
-                        
-                        Here is the resume content : {text}
-                        Here is the job description : {jd}
-                        Your Response Should have the following structure
-                        Example:
-                        
-                        Note: Only Mention and Analyze the content of the provided resume text. Make sure Nothing additional is added outside the provided text 
-                        
-                        Skills Improvement and Addition Suggestions:
-
-                        To further align your resume with the job requirements and the evolving trends in software engineering, consider the following improvements:
-
-                        Expand Knowledge in Emerging Technologies:
-                        - Dive into Machine Learning and Big Data Analytics; consider online courses or projects that demonstrate practical application.
-                        - Familiarize yourself with Blockchain Technology, given its growing impact on secure and decentralized systems.
-                        
-                        Enhance Cloud Computing Skills:
-                        - Gain deeper expertise in cloud services beyond AWS, such as Microsoft Azure or Google Cloud Platform, to showcase versatility.
-                        - Strengthen Soft Skills:
-                        Leadership and project management skills are highly valued; consider leading more projects or taking courses in Agile and Scrum methodologies.
-                        """
-
-                        response = get_gemini_response(prompt3)
-                    st.subheader("Skills Improvement Suggestions")
-                    st.write(response)
+                    inputs = input_key(role, text, jd)
+                    record = None if regenerate else history.find(history_owner, key, inputs)
+                    if record is not None:
+                        st.session_state['analysis_jobs'].pop(key, None)
+                        st.session_state['analysis_jobs'][key] = {
+                            "title": title, "job_id": None, "report": record.get("report"),
+                            "input_key": inputs, "role": role, "done": True, "text": record["text"],
+                            "error": None, "queue_position": 0, "worker_position": 0,
+                        }
+                        return
+                    report = None
+                    # Keyword results are computed locally and the model only
+                    # writes the final thoughts, unless the JD has no known
+                    # skill keywords; then the model does the whole match.
+                    result = score_match(text, jd, role) if key == "match" else None
+                    if result is not None and result["percentage"] is not None:
+                        report = format_match_report(result)
+                        prompt_template = build_match_thoughts_template(result)
+                    else:
+                        prompt_template = with_skill_hints(prompt_template, text, jd)
+                        # Only the resume sections this analysis needs are sent.
+                        text = analysis_text(parse_pdf(uploaded_file), key)
+                    # The answer is streamed into the job as it is generated.
+                    job_id = get_job_queue().submit(
+                        cached_gemini_stream, prompt_template, role, text, jd,
+                        refresh=regenerate, model_name=analysis_model(key),
+                        dedupe_key=(st.session_state.session_id, key, prompt_template, text, jd, regenerate))
+                    st.session_state['analysis_jobs'].pop(key, None)
+                    st.session_state['analysis_jobs'][key] = {
+                        "title": title, "job_id": job_id, "report": report,
+                        "input_key": inputs, "role": role, "done": False, "text": "", "error": None,
+                        "queue_position": 0, "worker_position": 0,
+                    }
                 else:
                     st.error("No job description provided.")
             else:
@@ -487,103 +385,86 @@ else:
             st.error("No job description provided.")
             st.error("Resume Not Uploaded.")
 
-    if submit4 and st.session_state['submit4_clicked']:
-        if len(role) > 0:
-            if uploaded_file is not None:
-                text = input_pdf_text(uploaded_file)
-                if len(jd) > 0:
-                    with st.spinner('Please Wait..'):
-                        prompt4 = f"""
-                        You are a professional and experienced ATS(Application Tracking System) with a deep understanding of {role} fields. Review the resume's bullet points in light of the job description. Provide targeted suggestions on how to edit existing bullet points to better align with the job requirements. Focus on enhancing clarity, relevance, and impact by incorporating keywords from the JD and emphasizing achievements and skills that are most pertinent to the job.
-                        
-                        Here is the resume content : {text}
-                        Here is the job description : {jd}
-                        Your Response Should have the following structure
-                        Example:
-                        
-                        Note: Only Mention and Analyze the content of the provided resume text. Make sure Nothing additional is added outside the provided text 
-                        
-                        Resume Customization Tips for Better Alignment with Job Description:
-
-                        Tailor Bullet Points:
-                        - Current: "Developed a web application using React and Node.js."
-                        - Revised: "Engineered a scalable web application using React and Node.js, incorporating microservices architecture to enhance modularity and deployability, directly supporting team objectives in agile development environments."
-                        
-                        Highlight Specific Achievements:
-                        - Current: "Designed cloud infrastructure for various projects."
-                        - Revised: "Strategically designed and deployed robust cloud infrastructure on AWS for 3 enterprise-level projects, achieving a 20% improvement in deployment efficiency and cost reduction."
-                        
-                        Incorporate Missing Keywords:
-                        If you have experience with Machine Learning, add a bullet point like: "Implemented machine learning    algorithms to automate data processing tasks, resulting in a 30% reduction in processing times."
-                        """
-
-                        response = get_gemini_response(prompt4)
-                    st.subheader("Customization Tips")
-                    st.write(response)
-                else:
-                    st.error("No job description provided.")
-            else:
-                st.error("No job description provided.")
-                st.error("Resume Not Uploaded.")
+    def read_job(key, entry):
+        # Copy the job's progress into the entry; True while it is running.
+        if entry["done"]:
+            return False
+        queue = get_job_queue()
+        job = queue.get(entry["job_id"])
+        if job is None:
+            entry.update(done=True, error="This analysis expired; please run it again.")
+        elif not job.finished:
+            entry.update(text=job.partial, queue_position=job.queue_position,
+                         worker_position=queue.waiting_position(job))
+            return True
         else:
-            st.error("No Job Role Specified")
-            st.error("No job description provided.")
-            st.error("Resume Not Uploaded.")
-
-    if submit5 and st.session_state['submit5_clicked']:
-        if len(role) > 0:
-            if uploaded_file is not None:
-                text = input_pdf_text(uploaded_file)
-                if len(jd) > 0:
-                    with st.spinner('Please Wait..'):
-                        prompt5 = f"""
-                        You are a professional and experienced ATS(Application Tracking System) with a deep understanding of {role} fields. Analyze the provided resume and job description (JD). Generate a set of interview questions and suggested answers tailored to this specific context. The questions should be designed to explore the candidate's technical skills, experiences, and personal attributes relevant to the role, as described in the JD and evidenced in the resume. Provide 5 technical interview questions (1 easy question, 2 medium questions, 3 hard questions) focusing on the key skills and technologies mentioned in the JD and resume. The technical questions should sound specific and technical. Additionally, provide 5 HR interview questions (1 easy question, 2 medium questions, 3 hard questions) that probe into the candidate's behavioral traits, problem-solving abilities, and cultural fit for the organization. For each question, include a detailed sample answer that highlights how the candidate can effectively showcase their relevant skills, experiences, and achievements from their resume in response to the job requirements outlined in the JD."
-
-                        Here is the resume content : {text}
-                        Here is the job description : {jd}
-                        Instructions for Response:
-
-                        Technical Questions:
-                        Create questions that are directly related to the technical skills and experiences mentioned in the JD and resume.
-                        Ensure questions cover a range of difficulties (easy, medium, hard) and are relevant to real-world scenarios the candidate might face in the role.
-                        
-                        HR Questions:
-                        Formulate questions that assess cultural fit, teamwork, leadership, and resilience.
-                        Questions should invite responses that allow the candidate to demonstrate their problem-solving approach, adaptability, and growth mindset.
-                        
-                        Suggested Answers:
-                        Provide comprehensive sample answers for each question, guiding the candidate on how to integrate their specific experiences and achievements from the resume.
-                        Highlight how each answer can align with the expectations set forth in the JD, showcasing the candidate's suitability for the role.
-                        
-                        Your Response Should have the following structure
-                        
-                        Technical Interview Questions:
-                        
-                        Question1: (Question here)
-                        
-                        Answer1: (Answer here)
-                        
-                        Similarly all other questions.
-                        
-                        HR Interview Questions:
-                        
-                        Question1: (Question here)
-                        
-                        Answer1: (Answer here)
-                        
-                        Similarly all other questions.
-                        """
-
-                        response = get_gemini_response(prompt5)
-                    st.subheader("Interview Preperation Guide ")
-                    st.write("Here are some sample Technical and HR interview questions which will help you in answering different questions faced in the interviews.")
-                    st.write(response)
-                else:
-                    st.error("No job description provided.")
+            entry.update(done=True, text=job.result or job.partial,
+                         error=str(job.error) if job.error is not None else None)
+            queue.discard(job.id)
+            if entry["error"] is None:
+                # The role the analysis ran with, not the role box now.
+                record = history.save(history_owner, key, entry["input_key"], title=entry["title"],
+                                      role=entry["role"], report=entry["report"], text=entry["text"])
+                if 'history_records' in st.session_state:
+                    st.session_state['history_records'].insert(0, record)
+        return False
+
+    def show_analyses(polling):
+        pending = False
+        for key, entry in list(st.session_state['analysis_jobs'].items()):
+            pending |= read_job(key, entry)
+            st.subheader(entry["title"])
+            if key == "interview":
+                st.write("Here are some sample Technical and HR interview questions which will help you in answering different questions faced in the interviews.")
+            if entry["report"]:
+                st.text(entry["report"])
+                st.write("Final Thoughts:")
+            if entry["error"]:
+                st.error(f"Error processing request: {entry['error']}")
+            elif entry["text"]:
+                st.markdown(entry["text"])
+            elif entry["worker_position"]:
+                st.caption(f"Waiting for a free worker · position {entry['worker_position']}")
+            elif entry["queue_position"]:
+                st.caption(f"Waiting for Gemini quota · position {entry['queue_position']} in queue")
             else:
-                st.error("No job description provided.")
-                st.error("Resume Not Uploaded.")
-        else:
-            st.error("No Job Role Specified")
-            st.error("No job description provided.")
-            st.error("Resume Not Uploaded.")
+                st.caption("Please Wait..")
+        if polling and not pending:
+            st.rerun()  # all answers are in: stop polling
+
+
+    # Process button clicks
+    for clicked, key in ((submit1 and st.session_state['submit1_clicked'], "summary"),
+                         (submit2 and st.session_state['submit2_clicked'], "match"),
+                         (submit3 and st.session_state['submit3_clicked'], "skills"),
+                         (submit4 and st.session_state['submit4_clicked'], "customization"),
+                         (submit5 and st.session_state['submit5_clicked'], "interview")):
+        if clicked:
+            run_analysis(key)
+
+    if st.session_state['analysis_jobs']:
+        if st.button("Clear results"):
+            st.session_state['analysis_jobs'] = {}
+            st.rerun()
+        polling = any(not entry["done"] for entry in st.session_state['analysis_jobs'].values())
+        st.fragment(run_every=1.0 if polling else None)(show_analyses)(polling)
+
+    # Earlier analyses, fetched a page at a time and only once asked for.
+    if st.toggle("Show previous analyses", key="show_history"):
+        if 'history_records' not in st.session_state:
+            st.session_state['history_records'] = history.page(history_owner)
+            st.session_state['history_exhausted'] = len(st.session_state['history_records']) < HISTORY_PAGE_SIZE
+        records = st.session_state['history_records']
+        if not records:
+            st.caption("No previous analyses yet.")
+        for record in records:
+            created = time.strftime("%d %b %H:%M", time.localtime(record["created_at"]))
+            with st.expander(f"{record['title']} · {record.get('role', '')} · {created}"):
+                if record.get("report"):
+                    st.text(record["report"])
+                st.markdown(record["text"])
+        if records and not st.session_state['history_exhausted'] and st.button("Load older"):
+            older = history.page(history_owner, before=records[-1]["created_at"])
+            records.extend(older)
+            st.session_state['history_exhausted'] = len(older) < HISTORY_PAGE_SIZE
+            st.rerun()
@@ -0,0 +1,143 @@
+import hashlib
+import os
+
+from dotenv import load_dotenv
+import google.generativeai as genai
+import streamlit as st
+
+from compaction import compact_jd, compact_resume
+from rate_limiter import get_scheduler
+from response_cache import ResponseCache, make_key
+from single_flight import ABANDONED, SingleFlight
+from tracing import span
+
+load_dotenv()
+
+DEFAULT_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
+
+# Model per analysis key; anything not listed uses DEFAULT_MODEL. The match
+# score stays on the fast model, interview prep gets the larger one.
+ANALYSIS_MODELS = {
+    "match": os.getenv("GEMINI_MATCH_MODEL", DEFAULT_MODEL),
+    "interview": os.getenv("GEMINI_INTERVIEW_MODEL", "gemini-2.5-pro"),
+}
+
+response_cache = ResponseCache()
+# Identical prompts already being answered are shared, not sent again.
+in_flight = SingleFlight()
+
+
+# --------------------------
+# Model registry
+# --------------------------
+# Configured once per process and shared by every session and worker thread;
+# st.cache_resource serialises the first build of each entry.
+@st.cache_resource
+def _configure_genai():
+    genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+    return True
+
+
+@st.cache_resource
+def get_model(model_name=DEFAULT_MODEL):
+    _configure_genai()
+    return genai.GenerativeModel(model_name)
+
+
+def analysis_model(key):
+    return ANALYSIS_MODELS.get(key, DEFAULT_MODEL)
+
+
+# json_mode asks the API for a bare JSON body (structured_output.py).
+JSON_GENERATION_CONFIG = {"response_mime_type": "application/json"}
+
+
+def prompt_key(input_text, model_name, json_mode=False):
+    """Single-flight key: the rendered prompt and how it is sent."""
+    return hashlib.sha256(f"{model_name}\x1f{json_mode:d}\x1f{input_text}".encode("utf-8")).hexdigest()
+
+
+def _generate(input_text, model_name, json_mode):
+    with span("gemini.generate", model=model_name, json_mode=json_mode,
+              prompt_chars=len(input_text)) as trace:
+        response = get_scheduler(model_name).call(
+            get_model(model_name).generate_content, input_text,
+            generation_config=JSON_GENERATION_CONFIG if json_mode else None)
+        trace.set(response_chars=len(response.text))
+        return response.text
+
+
+# Calls wait their turn in the per-model scheduler (rate_limiter.py); a call
+# identical to one in flight waits for that one instead.
+def get_gemini_response(input_text, model_name=DEFAULT_MODEL, json_mode=False):
+    with span("gemini.response", model=model_name):
+        return in_flight.do(prompt_key(input_text, model_name, json_mode),
+                            _generate, input_text, model_name, json_mode)
+
+
+# Fill the template and ask Gemini, unless the same template, role, resume
+# and JD were answered before. refresh=True skips the lookup ("regenerate")
+# and overwrites the stored answer. Resume and JD are compacted to their
+# token budgets first, so the cache is keyed on what is actually sent.
+def cached_gemini_response(prompt_template, role, text, jd, refresh=False,
+                           model_name=DEFAULT_MODEL, json_mode=False):
+    with span("gemini.cached_response", model=model_name) as trace:
+        text, jd = compact_resume(text), compact_jd(jd)
+        key = make_key(prompt_template, role, text, jd, model_name)
+        if not refresh:
+            cached = response_cache.get(key)
+            if cached is not None:
+                trace.set(cache_hit=True)
+                return cached
+        trace.set(cache_hit=False)
+        response = get_gemini_response(prompt_template.format(role=role, text=text, jd=jd),
+                                       model_name, json_mode)
+        response_cache.set(key, response)
+        return response
+
+
+# The leading stream yields chunks as they arrive; an identical request made
+# meanwhile gets the complete answer as one chunk when it finishes.
+def stream_gemini_response(input_text, model_name=DEFAULT_MODEL):
+    key = prompt_key(input_text, model_name)
+    while True:
+        flight = in_flight.claim(key)
+        if flight.leader:
+            break
+        result = flight.wait()
+        if result is not ABANDONED:
+            yield result
+            return
+    chunks = []
+    try:
+        with span("gemini.stream_start", model=model_name, prompt_chars=len(input_text)):
+            stream = get_scheduler(model_name).call(
+                get_model(model_name).generate_content, input_text, stream=True)
+        for chunk in stream:
+            if chunk.text:
+                chunks.append(chunk.text)
+                yield chunk.text
+    except BaseException as e:
+        flight.fail(e)
+        raise
+    flight.finish("".join(chunks))
+
+
+# Streaming counterpart of cached_gemini_response: yields text chunks as they
+# arrive and stores the full answer once the stream completes. A cache hit is
+# yielded as a single chunk.
+def cached_gemini_stream(prompt_template, role, text, jd, refresh=False,
+                         model_name=DEFAULT_MODEL):
+    text, jd = compact_resume(text), compact_jd(jd)
+    key = make_key(prompt_template, role, text, jd, model_name)
+    if not refresh:
+        cached = response_cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+    chunks = []
+    for chunk in stream_gemini_response(prompt_template.format(role=role, text=text, jd=jd),
+                                        model_name):
+        chunks.append(chunk)
+        yield chunk
+    response_cache.set(key, "".join(chunks))
@@ -0,0 +1,110 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+
+import pymongo
+from cachetools import LRUCache
+from pymongo.errors import PyMongoError
+import streamlit as st
+
+from mongo_client import get_analysis_history_collection, mongo_available
+from tracing import span
+
+logger = logging.getLogger(__name__)
+
+# --------------------------
+# Analysis history
+# --------------------------
+# Every finished analysis is kept per owner (the logged-in email, else the
+# session), keyed by its inputs, so showing it again, after a rerun or a
+# repeat click, costs no LLM call. Recent records live in memory; with
+# ANALYSIS_HISTORY_MONGO=1 they are also written to Mongo, which then serves
+# older pages and history from earlier visits.
+HISTORY_MONGO = os.getenv("ANALYSIS_HISTORY_MONGO", "").lower() in ("1", "true", "yes")
+HISTORY_MAX_PER_OWNER = int(os.getenv("ANALYSIS_HISTORY_MAX_PER_OWNER", 50))
+HISTORY_MAX_OWNERS = int(os.getenv("ANALYSIS_HISTORY_MAX_OWNERS", 10_000))
+HISTORY_PAGE_SIZE = 5
+
+
+def input_key(role, text, jd):
+    """Digest of the inputs an analysis depends on."""
+    parts = (role.strip().lower(), text, jd.strip())
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class AnalysisHistory:
+    def __init__(self, get_collection=None, max_per_owner=HISTORY_MAX_PER_OWNER,
+                 max_owners=HISTORY_MAX_OWNERS):
+        self._get_collection = get_collection
+        self.max_per_owner = max_per_owner
+        self._records = LRUCache(maxsize=max_owners)  # owner -> records, oldest first
+        self._lock = threading.Lock()
+        self._indexed = False
+
+    def _collection(self):
+        if self._get_collection is None or not mongo_available():
+            return None
+        collection = self._get_collection()
+        if not self._indexed:
+            collection.create_index([("owner", pymongo.ASCENDING), ("created_at", pymongo.DESCENDING)])
+            collection.create_index([("owner", pymongo.ASCENDING), ("input_key", pymongo.ASCENDING),
+                                     ("analysis", pymongo.ASCENDING)])
+            self._indexed = True
+        return collection
+
+    def save(self, owner, analysis, input_key, **fields):
+        """Store a finished analysis; fields are e.g. title, role, text."""
+        record = dict(fields, owner=owner, analysis=analysis, input_key=input_key,
+                      created_at=time.time())
+        with self._lock:
+            records = self._records.get(owner, [])
+            records.append(record)
+            self._records[owner] = records[-self.max_per_owner:]
+        try:
+            collection = self._collection()
+            if collection is not None:
+                with span("mongo.insert_one", collection="analysis_history"):
+                    collection.insert_one(dict(record))
+        except PyMongoError as e:
+            logger.warning("Analysis history not written to Mongo: %s", e)
+        return record
+
+    def find(self, owner, analysis, input_key):
+        """The latest stored analysis for these inputs, or None."""
+        with self._lock:
+            for record in reversed(self._records.get(owner, [])):
+                if record["analysis"] == analysis and record["input_key"] == input_key:
+                    return record
+        try:
+            collection = self._collection()
+            if collection is not None:
+                return collection.find_one(
+                    {"owner": owner, "analysis": analysis, "input_key": input_key},
+                    {"_id": False}, sort=[("created_at", pymongo.DESCENDING)])
+        except PyMongoError as e:
+            logger.warning("Analysis history lookup failed: %s", e)
+        return None
+
+    def page(self, owner, before=None, limit=HISTORY_PAGE_SIZE):
+        """Up to limit records created before `before`, newest first."""
+        try:
+            collection = self._collection()
+            if collection is not None:
+                query = {"owner": owner}
+                if before is not None:
+                    query["created_at"] = {"$lt": before}
+                return list(collection.find(query, {"_id": False})
+                            .sort("created_at", pymongo.DESCENDING).limit(limit))
+        except PyMongoError as e:
+            logger.warning("Analysis history page from memory only: %s", e)
+        with self._lock:
+            records = self._records.get(owner, [])
+            older = [r for r in reversed(records) if before is None or r["created_at"] < before]
+        return older[:limit]
+
+
+@st.cache_resource
+def get_analysis_history():
+    return AnalysisHistory(get_analysis_history_collection if HISTORY_MONGO else None)
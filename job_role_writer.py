@@ -0,0 +1,96 @@
+import atexit
+import datetime
+import logging
+import os
+import threading
+
+from cachetools import TTLCache
+from pymongo.errors import BulkWriteError, PyMongoError
+import streamlit as st
+
+from mongo_client import get_job_role_collection
+from tracing import span
+
+logger = logging.getLogger(__name__)
+
+JOB_ROLE_FLUSH_SECONDS = float(os.getenv("JOB_ROLE_FLUSH_SECONDS", 5))
+JOB_ROLE_BATCH_SIZE = int(os.getenv("JOB_ROLE_BATCH_SIZE", 200))
+# Upper bound on roles held while Mongo is unreachable.
+JOB_ROLE_MAX_PENDING = int(os.getenv("JOB_ROLE_MAX_PENDING", 50_000))
+
+
+# --------------------------
+# Write-behind job-role buffer
+# --------------------------
+# Every rerun with a filled role box used to insert the same role again. Roles
+# are now deduplicated per (session, role) in memory and written in batches by
+# a background thread, on a timer or as soon as a batch fills up. A failed
+# batch is put back and retried on the next flush.
+class JobRoleWriter:
+    def __init__(self, get_collection, flush_seconds=JOB_ROLE_FLUSH_SECONDS,
+                 batch_size=JOB_ROLE_BATCH_SIZE, max_pending=JOB_ROLE_MAX_PENDING):
+        self._get_collection = get_collection
+        self.flush_seconds = flush_seconds
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self._pending = []
+        self._seen = TTLCache(maxsize=100_000, ttl=24 * 3600)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="job-role-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def submit(self, session_id, role):
+        """Queue a role once per session; returns False if it was already queued."""
+        role = role.strip()
+        key = (session_id, role.lower())
+        with self._lock:
+            if not role or key in self._seen:
+                return False
+            self._seen[key] = True
+            if len(self._pending) >= self.max_pending:
+                self._pending.pop(0)
+                logger.warning("Job-role buffer full; dropping oldest pending role")
+            self._pending.append({
+                'role_name': role,
+                'created_at': datetime.datetime.now(datetime.timezone.utc),
+            })
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self._wake.set()
+        return True
+
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return 0
+            try:
+                with span("mongo.insert_many", collection="job_roles", documents=len(batch)):
+                    self._get_collection().insert_many(batch, ordered=False)
+            except BulkWriteError as e:
+                # Unordered insert: only the documents that errored are retried.
+                failed = [batch[error['index']] for error in e.details.get('writeErrors', [])]
+                with self._lock:
+                    self._pending[:0] = failed
+                return len(batch) - len(failed)
+            except PyMongoError as e:
+                logger.warning("Job-role flush failed, will retry: %s", e)
+                with self._lock:
+                    self._pending[:0] = batch
+                return 0
+            return len(batch)
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            self.flush()
+
+
+@st.cache_resource
+def get_job_role_writer():
+    return JobRoleWriter(get_job_role_collection)
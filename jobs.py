@@ -0,0 +1,127 @@
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+from rate_limiter import GEMINI_BURST, GEMINI_RPM, request_context
+from tracing import span
+
+# --------------------------
+# Background analysis jobs
+# --------------------------
+# Analyses run on a process-wide pool instead of the script thread, so a
+# widget change that reruns the script neither cancels a Gemini call nor
+# loses its answer. Sessions keep job ids in st.session_state and poll; a
+# finished job is kept until it is read (or JOB_RESULT_TTL passes). A job
+# submitted again while an identical one is pending returns that job.
+# Workers mostly wait on Gemini. The scheduler (rate_limiter.py) limits how
+# often calls start, not how many run at once: at GEMINI_RPM starts a minute
+# and answers of up to JOB_ANSWER_SECONDS, about GEMINI_RPM / 2 calls can be
+# in flight, plus a burst. The pool is sized to that, so a job waits for a
+# worker only when Gemini could not have started it anyway.
+JOB_ANSWER_SECONDS = 30
+JOB_WORKERS = int(os.getenv("ANALYSIS_JOB_WORKERS",
+                            max(8, int(GEMINI_RPM * JOB_ANSWER_SECONDS / 60) + GEMINI_BURST)))
+JOB_RESULT_TTL = float(os.getenv("ANALYSIS_JOB_TTL", 3600))
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+class Job:
+    __slots__ = ("id", "dedupe_key", "state", "result", "error", "partial",
+                 "queue_position", "created_at", "finished_at")
+
+    def __init__(self, dedupe_key=None):
+        self.id = uuid.uuid4().hex
+        self.dedupe_key = dedupe_key
+        self.state = QUEUED
+        self.result = None
+        self.error = None
+        self.partial = ""
+        self.queue_position = 0
+        self.created_at = time.time()
+        self.finished_at = None
+
+    @property
+    def finished(self):
+        return self.state in (DONE, FAILED)
+
+    def _set_queue_position(self, position):
+        self.queue_position = position
+
+
+class JobQueue:
+    def __init__(self, workers=JOB_WORKERS, ttl=JOB_RESULT_TTL):
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="analysis-job")
+        self._jobs = {}
+        self._pending = {}  # dedupe key -> unfinished job
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, dedupe_key=None, **kwargs):
+        """Queue fn(*args, **kwargs) and return the job id.
+
+        A generator result is consumed in the worker, its chunks collected in
+        job.partial as they arrive and joined into job.result.
+        """
+        with self._lock:
+            self._prune()
+            job = self._pending.get(dedupe_key) if dedupe_key is not None else None
+            if job is not None:
+                return job.id
+            job = Job(dedupe_key)
+            self._jobs[job.id] = job
+            if dedupe_key is not None:
+                self._pending[dedupe_key] = job
+        self._executor.submit(self._run, job, fn, args, kwargs)
+        return job.id
+
+    def _run(self, job, fn, args, kwargs):
+        job.state = RUNNING
+        try:
+            with span("job.run", job=getattr(fn, "__name__", "job")), \
+                    request_context(on_queue=job._set_queue_position):
+                result = fn(*args, **kwargs)
+                if hasattr(result, "__next__"):
+                    for chunk in result:
+                        job.partial += chunk
+                    result = job.partial
+            job.result, job.state = result, DONE
+        except Exception as e:
+            job.error, job.state = e, FAILED
+        finally:
+            job.finished_at = time.time()
+            with self._lock:
+                if self._pending.get(job.dedupe_key) is job:
+                    del self._pending[job.dedupe_key]
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def waiting_position(self, job):
+        """1-based place among jobs waiting for a worker; 0 once it has one."""
+        if job.state != QUEUED:
+            return 0
+        with self._lock:
+            return sum(1 for other in self._jobs.values()
+                       if other.state == QUEUED and other.created_at <= job.created_at)
+
+    def discard(self, job_id):
+        """Forget a job once its result has been read."""
+        with self._lock:
+            self._jobs.pop(job_id, None)
+
+    def _prune(self):
+        cutoff = time.time() - self.ttl
+        for job_id in [job_id for job_id, job in self._jobs.items()
+                       if job.finished and job.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+
+@st.cache_resource
+def get_job_queue():
+    return JobQueue()
@@ -0,0 +1,56 @@
+from skill_taxonomy import CATEGORIES, extract
+
+# BM25 term-frequency saturation: a keyword repeated in the JD weighs more,
+# with diminishing returns.
+BM25_K1 = 1.2
+
+
+# --------------------------
+# Local Match Percentage
+# --------------------------
+# Resume and JD are normalised against the skill taxonomy (skill_taxonomy.py)
+# and compared in-process: deterministic, free and fast. Only the narrative
+# "Final Thoughts" still goes to the model.
+
+
+def _bm25_weight(tf):
+    return tf * (BM25_K1 + 1) / (tf + BM25_K1)
+
+
+def score_match(text, jd, role=""):
+    """Score a resume against a JD.
+
+    Returns {"percentage", "matched": {category: [names]}, "missing": [names]}
+    mirroring the sections of the Match Percentage prompt. percentage is None
+    when the JD names no skill the taxonomy knows: there is nothing to score
+    against, and callers fall back to the model's own match analysis.
+    """
+    jd_keywords = extract(f"{role}\n{jd}")
+    resume_keywords = extract(text)
+    matched = {category: [] for category in CATEGORIES}
+    missing = []
+    total = hit = 0.0
+    for (name, category), tf in jd_keywords.most_common():
+        weight = _bm25_weight(tf)
+        total += weight
+        if (name, category) in resume_keywords:
+            hit += weight
+            matched[category].append(name)
+        else:
+            missing.append(name)
+    percentage = round(100 * hit / total) if total else None
+    return {"percentage": percentage, "matched": matched, "missing": missing}
+
+
+def format_match_report(result, final_thoughts=None):
+    """Render a score_match result in the Match Percentage output structure."""
+    if result["percentage"] is None:
+        return "Percentage Match: n/a (no recognised skill keywords in the job description)"
+    lines = [f"Percentage Match: {result['percentage']}%", "", "Matched Keywords:"]
+    for category in CATEGORIES:
+        lines.append(f"- {category}: {', '.join(result['matched'][category]) or 'None'}")
+    lines += ["", "Missing Keywords:"]
+    lines += [f"- {name}" for name in result["missing"]] or ["- None"]
+    if final_thoughts:
+        lines += ["", "Final Thoughts:", final_thoughts.strip()]
+    return "\n".join(lines)
@@ -0,0 +1,64 @@
+import os
+from urllib.parse import quote_plus
+
+import pymongo
+from pymongo.errors import PyMongoError
+import streamlit as st
+
+DB_NAME = "lifeeazydb_prod"
+JOB_ROLE_COLLECTION = "collect_job_role"
+ANALYSIS_HISTORY_COLLECTION = "analysis_history"
+
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", 20))
+MONGO_TIMEOUT_MS = int(os.getenv("MONGO_TIMEOUT_MS", 2000))
+
+
+def mongo_uri():
+    """MONGO_URI, else credentials from database.x when present, else a local mongod."""
+    if os.getenv("MONGO_URI"):
+        return os.getenv("MONGO_URI")
+    try:
+        # Deployment config, kept out of the repository.
+        from database import x
+    except ImportError:
+        return "mongodb://localhost:27017/"
+    client_config = x['default'].get('CLIENT')
+    if client_config:
+        return "mongodb://{}:{}@{}:27017/".format(
+            quote_plus(client_config['username']),
+            quote_plus(client_config['password']),
+            client_config['host'],
+        )
+    return "mongodb://localhost:27017/"
+
+
+# One client (and so one socket pool) per process, shared by every session
+# and rerun. MongoClient connects lazily, so building it never blocks.
+@st.cache_resource
+def get_mongo_client():
+    return pymongo.MongoClient(
+        mongo_uri(),
+        maxPoolSize=MONGO_MAX_POOL_SIZE,
+        serverSelectionTimeoutMS=MONGO_TIMEOUT_MS,
+        connectTimeoutMS=MONGO_TIMEOUT_MS,
+        socketTimeoutMS=MONGO_TIMEOUT_MS * 5,
+        waitQueueTimeoutMS=MONGO_TIMEOUT_MS,
+    )
+
+
+def get_job_role_collection():
+    return get_mongo_client()[DB_NAME][JOB_ROLE_COLLECTION]
+
+
+def get_analysis_history_collection():
+    return get_mongo_client()[DB_NAME][ANALYSIS_HISTORY_COLLECTION]
+
+
+# Fast-fail health check, remembered briefly so reruns don't ping each time.
+@st.cache_data(ttl=30, show_spinner=False)
+def mongo_available():
+    try:
+        get_mongo_client().admin.command("ping")
+        return True
+    except PyMongoError:
+        return False
@@ -0,0 +1,109 @@
+import logging
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from tracing import span
+
+logger = logging.getLogger(__name__)
+
+OTP_SERVICE_URL = os.getenv("OTP_SERVICE_URL", "http://45.79.121.132:8001/SubscribeAndFeedback/")
+SUBSCRIBE_ENDPOINT = OTP_SERVICE_URL + "Otpgenerate/"
+OTP_VERIFICATION_ENDPOINT = OTP_SERVICE_URL + "OtpVerfication/"
+EMAIL_VERIFICATION_ENDPOINT = OTP_SERVICE_URL + "EmailVerification/"
+
+# (connect, read) seconds; a slow backend must not pin a Streamlit thread.
+OTP_TIMEOUT = (float(os.getenv("OTP_CONNECT_TIMEOUT", 3)), float(os.getenv("OTP_READ_TIMEOUT", 10)))
+OTP_RETRIES = int(os.getenv("OTP_RETRIES", 2))
+OTP_BACKOFF_SECONDS = 0.3
+# Consecutive failures that open the circuit, and how long it stays open.
+OTP_BREAKER_THRESHOLD = int(os.getenv("OTP_BREAKER_THRESHOLD", 5))
+OTP_BREAKER_COOLDOWN = float(os.getenv("OTP_BREAKER_COOLDOWN", 30))
+
+RETRY_STATUSES = {502, 503, 504}
+
+
+class OtpServiceUnavailable(Exception):
+    pass
+
+
+# --------------------------
+# Shared keep-alive session
+# --------------------------
+_session = requests.Session()
+_session.headers.update({'Content-Type': 'application/json'})
+_session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=32))
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=32))
+
+
+# --------------------------
+# Circuit breaker
+# --------------------------
+_breaker_lock = threading.Lock()
+_consecutive_failures = 0
+_open_until = 0.0
+
+
+def _check_breaker():
+    with _breaker_lock:
+        if time.monotonic() < _open_until:
+            raise OtpServiceUnavailable("OTP service is temporarily unavailable")
+
+
+def _record_result(ok):
+    global _consecutive_failures, _open_until
+    with _breaker_lock:
+        if ok:
+            _consecutive_failures = 0
+            return
+        _consecutive_failures += 1
+        if _consecutive_failures >= OTP_BREAKER_THRESHOLD:
+            _open_until = time.monotonic() + OTP_BREAKER_COOLDOWN
+            logger.warning("OTP service failing; pausing calls for %ss", OTP_BREAKER_COOLDOWN)
+
+
+def _post(url, payload):
+    """POST to the OTP service and return the decoded JSON body.
+
+    Failures where the request never reached the service (connection errors,
+    connect timeouts, 502/503/504) are retried with jittered exponential
+    backoff; a read timeout is not, since the OTP may already have been sent.
+    Raises OtpServiceUnavailable when the call fails or the circuit is open.
+    """
+    _check_breaker()
+    with span("otp.post", endpoint=url.rstrip("/").rsplit("/", 1)[-1]) as trace:
+        for attempt in range(OTP_RETRIES + 1):
+            trace.set(attempts=attempt + 1)
+            try:
+                r = _session.post(url, json=payload, timeout=OTP_TIMEOUT)
+                if r.status_code not in RETRY_STATUSES:
+                    data = r.json()
+                    _record_result(True)
+                    return data
+                error = f"HTTP {r.status_code}"
+            except requests.ConnectionError as e:
+                error = e
+            except (requests.Timeout, ValueError) as e:
+                _record_result(False)
+                raise OtpServiceUnavailable(f"OTP service request failed: {e}") from e
+            if attempt < OTP_RETRIES:
+                time.sleep(random.uniform(0, OTP_BACKOFF_SECONDS * 2 ** attempt))
+        _record_result(False)
+        raise OtpServiceUnavailable(f"OTP service request failed: {error}")
+
+
+def request_otp(email):
+    """Subscribe the email (if new) and send it an OTP."""
+    return _post(SUBSCRIBE_ENDPOINT, {"emailid": email}).get("Status") == 200
+
+
+def verify_otp(email, otp):
+    return _post(OTP_VERIFICATION_ENDPOINT, {"emailid": email, "otp": otp}).get("Status") == 200
+
+
+def check_email_exists(email):
+    return _post(EMAIL_VERIFICATION_ENDPOINT, {"emailid": email}).get("Status") == 200
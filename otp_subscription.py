@@ -1,30 +1,31 @@
 import streamlit as st
-import requests
+import otp_client
+from otp_client import OtpServiceUnavailable
+import uuid
 
-import pybase64
 import io
 from dotenv import load_dotenv
 
-import pymongo
 from pymongo import MongoClient
-import os 
 
 import streamlit as st
-import os
 from PIL import Image
-import PyPDF2 as pdf
-import google.generativeai as genai
+from assets import background_html, stylesheet_html
+from pdf_text import input_pdf_text
+from compaction import compact_resume
+from gemini import get_gemini_response
 import time
-from database import x
+from job_role_writer import get_job_role_writer
 import webbrowser
 
-# Define the endpoints
-SUBSCRIBE_ENDPOINT = "http://45.79.121.132:8001/SubscribeAndFeedback/Otpgenerate/"
-OTP_VERIFICATION_ENDPOINT = "http://45.79.121.132:8001/SubscribeAndFeedback/OtpVerfication/"
+# Endpoints, timeouts and retries live in otp_client
+OTP_UNAVAILABLE_MESSAGE = "The OTP service is not responding. Please try again shortly."
 
 # Initialize session state
 if 'logged_in' not in st.session_state:
     st.session_state.logged_in = False
+if 'session_id' not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
 if 'email' not in st.session_state:
     st.session_state.email = ""
 if 'otp_sent' not in st.session_state:
@@ -34,13 +35,13 @@ if 'login' not in st.session_state:
 
 # Function to subscribe and generate OTP
 def subscribe(email):
-    api = SUBSCRIBE_ENDPOINT
-    headers = {'Content-Type': 'application/json'}
-    mail = {"emailid": email}
-    r = requests.post(api, json=mail, headers=headers)
-    data = r.json()
+    try:
+        sent = otp_client.request_otp(email)
+    except OtpServiceUnavailable:
+        st.error(OTP_UNAVAILABLE_MESSAGE)
+        return
     
-    if data.get("Status") == 200:
+    if sent:
         st.session_state.otp_sent = True
         st.success(f"OTP sent successfully to {email}")
     else:
@@ -48,13 +49,11 @@ def subscribe(email):
 
 # Function to verify OTP
 def verify_otp(email, otp):
-    api = OTP_VERIFICATION_ENDPOINT
-    headers = {'Content-Type': 'application/json'}
-    data = {"emailid": email, "otp": otp}
-    r = requests.post(api, json=data, headers=headers)
-    response = r.json()
-    
-    return response.get("Status") == 200
+    try:
+        return otp_client.verify_otp(email, otp)
+    except OtpServiceUnavailable:
+        st.error(OTP_UNAVAILABLE_MESSAGE)
+        return False
 
 if st.session_state.login == False:
     # Streamlit UI
@@ -75,13 +74,7 @@ if st.session_state.login == False:
                 subscribe(st.session_state.email)
             if st.button('Login'):
                 if otp_input:
-                    
-                    api = OTP_VERIFICATION_ENDPOINT
-                    headers = {'Content-Type': 'application/json'}
-                    data = {"emailid": email, "otp": otp_input}
-                    r = requests.post(api, json=data, headers=headers)
-                    response = r.json()
-                    if response.get("Status") == 200:
+                    if verify_otp(email, otp_input):
                         st.success("Successfully logged in!")
                         st.session_state.login = True
                     else:
@@ -94,40 +87,11 @@ if st.session_state.login == False:
 else: #Loggedin successfully
     load_dotenv()
 
-    username = x['default']
-    try:
-        y=x['default']['CLIENT']
-        myclient = pymongo.MongoClient(f"mongodb://{username['CLIENT']['username']}:{username['CLIENT']['password']}@{username['CLIENT']['host']}:27017/")
-        print(myclient)
-        
-    except:
-        myclient = pymongo.MongoClient("mongodb://localhost:27017/")
-        print(myclient)
-        
-
-    mydb = myclient["lifeeazydb_prod"]
-    collection = mydb["collect_job_role"]
-
-
-    genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
-
-    def get_gemini_response(input):
-        model = genai.GenerativeModel('gemini-2.0-flash')
-        response = model.generate_content(input)
-        return response.text
-
-    def input_pdf_text(uploaded_file):
-        reader = pdf.PdfReader(uploaded_file)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text() or ''  # Ensure text is not None
-        return text
 
     ## ------- Streamlit app setup ---------
     st.set_page_config(page_title="ATSPro", page_icon="📑", layout = 'wide')
 
-    with open( "styles/main.css" ) as css:
-        st.markdown( f'<style>{css.read()}</style>' , unsafe_allow_html= True)
+    st.markdown(stylesheet_html("styles/main.css"), unsafe_allow_html=True)
 
 
     custom_sidebar_style = """
@@ -258,22 +222,8 @@ else: #Loggedin successfully
     #Set BAckground Image
 
     def set_bg_image(image_file):
-        with open(image_file, "rb") as file:
-            # Use base64 to encode the image file
-            encoded_image = pybase64.b64encode(file.read()).decode()
-
-        # Set the background using CSS styles
-        css_style = f"""
-        <style>
-        .stApp {{
-            background-image: url("data:image/png;base64,{encoded_image}");
-            background-size: cover;
-            background-position: center;
-        }}
-        </style>
-        """
-
-        st.markdown(css_style, unsafe_allow_html=True)
+        # Resized, re-encoded and memoized once per process
+        st.markdown(background_html(image_file), unsafe_allow_html=True)
 
     set_bg_image("background.JPG")
 
@@ -287,9 +237,8 @@ else: #Loggedin successfully
 
     if role != '':
         st.write(f":black[You entered **{role}** as your role.]")
-        # Save the job role to the MongoDB collection
-        job_role_data = {'role_name': role}
-        collection.insert_one(job_role_data)
+        # Save the job role to MongoDB (deduplicated per session, written in batches)
+        get_job_role_writer().submit(st.session_state.session_id, role)
         st.success(f"Job Role '{role}' saved successfully!")
     # else:
     #     st.write("Enter a Job Role")
@@ -376,7 +325,7 @@ else: #Loggedin successfully
     if submit1 and st.session_state['submit1_clicked']:
         if len(role) > 0:
             if uploaded_file is not None:
-                text = input_pdf_text(uploaded_file)
+                text = compact_resume(input_pdf_text(uploaded_file))
                 if len(jd) > 0:
                     with st.spinner('Please Wait..'):
                         prompt1 = f"""
@@ -420,7 +369,7 @@ else: #Loggedin successfully
     if submit2 and st.session_state['submit2_clicked']:
         if len(role) > 0:
             if uploaded_file is not None:
-                text = input_pdf_text(uploaded_file)
+                text = compact_resume(input_pdf_text(uploaded_file))
                 if len(jd) > 0:
                     with st.spinner('Please Wait..'):
                         prompt2 = f"""
@@ -468,7 +417,7 @@ else: #Loggedin successfully
     if submit3 and st.session_state['submit3_clicked']:
         if len(role) > 0:
             if uploaded_file is not None:
-                text = input_pdf_text(uploaded_file)
+                text = compact_resume(input_pdf_text(uploaded_file))
                 if len(jd) > 0:
                     with st.spinner('Please Wait..'):
                         prompt3 = f"""
@@ -511,7 +460,7 @@ else: #Loggedin successfully
     if submit4 and st.session_state['submit4_clicked']:
         if len(role) > 0:
             if uploaded_file is not None:
-                text = input_pdf_text(uploaded_file)
+                text = compact_resume(input_pdf_text(uploaded_file))
                 if len(jd) > 0:
                     with st.spinner('Please Wait..'):
                         prompt4 = f"""
@@ -554,7 +503,7 @@ else: #Loggedin successfully
     if submit5 and st.session_state['submit5_clicked']:
         if len(role) > 0:
             if uploaded_file is not None:
-                text = input_pdf_text(uploaded_file)
+                text = compact_resume(input_pdf_text(uploaded_file))
                 if len(jd) > 0:
                     with st.spinner('Please Wait..'):
                         prompt5 = f"""
@@ -0,0 +1,241 @@
+import hashlib
+import io
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, CancelledError, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import PyPDF2 as pdf
+from cachetools import LRUCache
+
+from tracing import span
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:  # optional fast path
+    pdfium = None
+
+logger = logging.getLogger(__name__)
+
+# --------------------------
+# Resume text cache
+# --------------------------
+# Extracted text is keyed by a SHA-256 of the uploaded bytes, so every button
+# press and every session in this worker parses a given PDF only once. The
+# cache is bounded by the total number of characters it holds.
+TEXT_CACHE_MAX_CHARS = int(os.getenv("RESUME_TEXT_CACHE_CHARS", 20_000_000))
+
+_text_cache = LRUCache(maxsize=TEXT_CACHE_MAX_CHARS, getsizeof=len)
+_text_cache_lock = threading.Lock()
+
+# --------------------------
+# Extraction limits
+# --------------------------
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", 50))
+PDF_MAX_CHARS = int(os.getenv("PDF_MAX_CHARS", 200_000))
+PDF_PAGE_TIMEOUT = float(os.getenv("PDF_PAGE_TIMEOUT", 5))
+# Documents shorter than this are extracted in-process; the pool only pays off
+# for long CVs and portfolios.
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", 8))
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", min(4, os.cpu_count() or 1)))
+
+
+def read_pdf_bytes(source):
+    """Return the raw bytes of a path, a Streamlit UploadedFile or a file object."""
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            return f.read()
+    if hasattr(source, "getvalue"):
+        return source.getvalue()
+    source.seek(0)
+    return source.read()
+
+
+def file_digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+# --------------------------
+# Page extractors
+# --------------------------
+# Each takes the PDF bytes and a page range and returns one string per page.
+# They run in worker processes, so they must stay module-level functions.
+def _pages_pypdf2(data, start, stop):
+    reader = pdf.PdfReader(io.BytesIO(data))
+    return [reader.pages[i].extract_text() or '' for i in range(start, stop)]
+
+
+def _pages_pdfium(data, start, stop):
+    document = pdfium.PdfDocument(data)
+    try:
+        return [document[i].get_textpage().get_text_range() for i in range(start, stop)]
+    finally:
+        document.close()
+
+
+EXTRACTORS = {"pypdf2": _pages_pypdf2}
+if pdfium is not None:
+    EXTRACTORS["pypdfium2"] = _pages_pdfium
+
+_selected_extractor = os.getenv("PDF_EXTRACTOR") or None
+_pool = None
+_pool_users = {}  # pool -> documents currently extracting on it
+_retired_pools = set()
+_pool_lock = threading.Lock()
+
+
+def benchmark_extractors(data, pages=3):
+    """Time every available extractor on the first pages of data, fastest first."""
+    page_count = min(pages, len(pdf.PdfReader(io.BytesIO(data)).pages))
+    timings = []
+    for name, extract in EXTRACTORS.items():
+        started = time.perf_counter()
+        try:
+            extract(data, 0, page_count)
+        except Exception:
+            continue
+        timings.append((name, time.perf_counter() - started))
+    return sorted(timings, key=lambda timing: timing[1])
+
+
+def _extractor_name(data):
+    # The fastest extractor on the first document seen is used from then on.
+    global _selected_extractor
+    if _selected_extractor is None:
+        timings = benchmark_extractors(data) if len(EXTRACTORS) > 1 else []
+        _selected_extractor = timings[0][0] if timings else "pypdf2"
+        logger.info("PDF extractor selected: %s (%s)", _selected_extractor, timings)
+    return _selected_extractor
+
+
+# --------------------------
+# Worker pool
+# --------------------------
+# One pool is shared by every document. A page range that hangs cannot be
+# cancelled, so its document retires the pool instead: new documents get a
+# fresh one, and the old workers are killed once no document still uses them.
+def _acquire_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn, not fork: the Streamlit server process is multithreaded
+            _pool = ProcessPoolExecutor(max_workers=PDF_WORKERS,
+                                        mp_context=multiprocessing.get_context("spawn"))
+        _pool_users[_pool] = _pool_users.get(_pool, 0) + 1
+        return _pool
+
+
+def _release_pool(pool, retire=False):
+    global _pool
+    with _pool_lock:
+        if retire:
+            _retired_pools.add(pool)
+            if _pool is pool:
+                _pool = None
+        _pool_users[pool] -= 1
+        if _pool_users[pool]:
+            return
+        del _pool_users[pool]
+        if pool not in _retired_pools:
+            return
+        _retired_pools.discard(pool)
+    for process in list((pool._processes or {}).values()):
+        process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _extract_parallel(extract, data, page_count):
+    """(pages, complete): complete is False when a page range timed out.
+
+    Each range gets PDF_PAGE_TIMEOUT per page from when a worker picks it up,
+    not from submission, so waiting behind other documents does not count.
+    Ranges lost to a broken pool are extracted in-process with PyPDF2.
+    """
+    chunk = -(-page_count // PDF_WORKERS)
+    ranges = [(start, min(start + chunk, page_count)) for start in range(0, page_count, chunk)]
+    results, complete, retire = {}, True, False
+    pool = _acquire_pool()
+    try:
+        try:
+            futures = {pool.submit(extract, data, start, stop): (start, stop) for start, stop in ranges}
+        except BrokenProcessPool:
+            retire, futures = True, {}
+            results = {start: _pages_pypdf2(data, start, stop) for start, stop in ranges}
+        started = {}
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=0.25, return_when=FIRST_COMPLETED)
+            now = time.monotonic()
+            for future in done:
+                start, stop = futures[future]
+                try:
+                    results[start] = future.result()
+                except (BrokenProcessPool, CancelledError):
+                    retire = True
+                    results[start] = _pages_pypdf2(data, start, stop)
+            for future in list(pending):
+                start, stop = futures[future]
+                if future.running():
+                    started.setdefault(future, now)
+                if future in started and now - started[future] > PDF_PAGE_TIMEOUT * (stop - start):
+                    logger.warning("PDF pages %s-%s timed out; skipped", start + 1, stop)
+                    pending.discard(future)
+                    complete, retire = False, True
+    finally:
+        _release_pool(pool, retire)
+    pages = [page for start, _ in ranges for page in results.get(start, [])]
+    return pages, complete
+
+
+def _extract(data):
+    page_count = min(len(pdf.PdfReader(io.BytesIO(data)).pages), PDF_MAX_PAGES)
+    extract = EXTRACTORS[_extractor_name(data)]
+    if page_count >= PDF_PARALLEL_MIN_PAGES and PDF_WORKERS > 1:
+        pages, complete = _extract_parallel(extract, data, page_count)
+    else:
+        pages, complete = extract(data, 0, page_count), True
+    return "\f".join(pages)[:PDF_MAX_CHARS], complete
+
+
+def extract_pdf_text(data):
+    """Extract up to PDF_MAX_PAGES pages and PDF_MAX_CHARS characters of text.
+
+    Pages are separated by form feeds so page headers and footers can be told
+    apart later (compaction.py).
+    """
+    return _extract(data)[0]
+
+
+def input_pdf_text(uploaded_file):
+    with span("pdf.extract") as trace:
+        data = read_pdf_bytes(uploaded_file)
+        key = file_digest(data)
+
+        with _text_cache_lock:
+            text = _text_cache.get(key)
+        if text is not None:
+            trace.set(cache_hit=True, bytes=len(data))
+            return text
+
+        text, complete = _extract(data)
+        trace.set(cache_hit=False, bytes=len(data), chars=len(text), complete=complete)
+        if not complete:
+            # Pages timed out; try again next time rather than keep the gap.
+            return text
+        with _text_cache_lock:
+            try:
+                _text_cache[key] = text
+            except ValueError:
+                # Larger than the whole cache; serve it uncached.
+                pass
+        return text
+
+
+def clear_text_cache():
+    with _text_cache_lock:
+        _text_cache.clear()
@@ -0,0 +1,252 @@
+import re
+
+from skill_taxonomy import CATEGORIES, classify
+
+# --------------------------
+# Prompt templates
+# --------------------------
+# Every analysis is a task description, the resume/JD block and an output
+# format. Templates are filled with str.format(role=..., text=..., jd=...).
+
+DOCUMENTS_BLOCK = """
+Here is the resume content : {text}
+Here is the job description : {jd}
+"""
+
+SUMMARY_TASK = """You are a professional and experienced ATS(Application Tracking System) with a deep understanding of {role} fields. Analyze the provided resume and job description (JD). Provide a detailed analysis (200-300 words) of how the resume aligns with the JD, highlighting key areas of strength, relevant experiences, and qualifications. Discuss any notable achievements or skills that are particularly well-matched to the job requirements.
+"""
+
+SUMMARY_FORMAT = """Your Response Should have the following structure
+Example:
+
+Note: Only Mention and Analyze the content of the provided resume text. Make sure Nothing additional is added outside the provided text
+
+Resume Analysis and Alignment with Job Description:
+
+Overview:
+The resume presents a strong background in software engineering, with a particular emphasis on full-stack development and cloud technologies.
+
+Strengths:
+- Technical Proficiency: Proficient in key programming languages such as Python, JavaScript, and Java, aligning well with the job's technical requirements.
+- Project Experience: Showcases several projects that demonstrate the ability to design, develop, and deploy scalable software solutions, mirroring the JD's emphasis on hands-on experience.
+
+Relevant Experiences: (Highlight only the things that are present in the resume.)
+- Lead Developer Role: Led a team in developing a SaaS application using microservices architecture, directly relevant to the job's focus on leadership and microservices.
+- Cloud Solutions Architect: Experience in designing cloud infrastructure on AWS, aligning with the JD's requirement for cloud computing skills.
+"""
+
+MATCH_TASK = """You are a professional and experienced ATS(Application Tracking System) focused exclusively on the {role} field. Your task is to evaluate the resume strictly based on the provided job description and resume content. It is critical to only identify and list the keywords and phrases that have a direct match between the resume and the JD. Highlight any crucial keywords or skills required for the job that are absent in the resume. Based on your analysis, provide a percentage match.
+
+Important: Your analysis must strictly adhere to the content provided below. Do not infer or add any keywords, skills, or technologies not explicitly mentioned in these texts. Re-evaluate the texts to ensure accuracy. Recheck before you provide your response
+"""
+
+MATCH_FORMAT = """Never provide anything which is neither present in resume content nor job description.
+
+Output should strictly follow this structure:
+
+Percentage Match: [Provide percentage]
+
+Matched Keywords:
+- Skills: [List only the matched skills found in both the job description and resume content. recheck before you provide your response]
+- Technologies: [List only the matched technologies found in both the job description and resume. Recheck before you provide your response]
+- Methodologies: [List only the matched methodologies found in both the job description and resume. Recheck before you provide your response]
+
+Missing Keywords:
+- [List the skills or technologies crucial for the role found in the job description but not in the resume. Recheck before you provide your response]
+
+Final Thoughts:
+- [Provide a brief assessment focusing on the alignment, matched keywords, missing elements, and percentage match. Reinforce the instruction to only mention elements present in the provided texts. Recheck before you provide your response]
+"""
+
+SKILLS_TASK = """You are a professional and experienced ATS(Application Tracking System) with a deep understanding of {role} fields. Based on the analysis of the resume and the job description, suggest specific improvements and additions to the candidate's skill set (200-300 words). Identify areas where the candidate falls short and recommend actionable steps or resources for acquiring or enhancing the necessary skills. Highlight the importance of these skills in the context of the targeted job role.
+"""
+
+SKILLS_FORMAT = """Your Response Should have the following structure
+Example:
+
+Note: Only Mention and Analyze the content of the provided resume text. Make sure Nothing additional is added outside the provided text
+
+Skills Improvement and Addition Suggestions:
+
+To further align your resume with the job requirements and the evolving trends in software engineering, consider the following improvements:
+
+Expand Knowledge in Emerging Technologies:
+- Dive into Machine Learning and Big Data Analytics; consider online courses or projects that demonstrate practical application.
+- Familiarize yourself with Blockchain Technology, given its growing impact on secure and decentralized systems.
+
+Enhance Cloud Computing Skills:
+- Gain deeper expertise in cloud services beyond AWS, such as Microsoft Azure or Google Cloud Platform, to showcase versatility.
+- Strengthen Soft Skills:
+Leadership and project management skills are highly valued; consider leading more projects or taking courses in Agile and Scrum methodologies.
+"""
+
+CUSTOMIZATION_TASK = """You are a professional and experienced ATS(Application Tracking System) with a deep understanding of {role} fields. Review the resume's bullet points in light of the job description. Provide targeted suggestions on how to edit existing bullet points to better align with the job requirements. Focus on enhancing clarity, relevance, and impact by incorporating keywords from the JD and emphasizing achievements and skills that are most pertinent to the job.
+"""
+
+CUSTOMIZATION_FORMAT = """Your Response Should have the following structure
+Example:
+
+Note: Only Mention and Analyze the content of the provided resume text. Make sure Nothing additional is added outside the provided text
+
+Resume Customization Tips for Better Alignment with Job Description:
+
+Tailor Bullet Points:
+- Current: "Developed a web application using React and Node.js."
+- Revised: "Engineered a scalable web application using React and Node.js, incorporating microservices architecture to enhance modularity and deployability, directly supporting team objectives in agile development environments."
+
+Highlight Specific Achievements:
+- Current: "Designed cloud infrastructure for various projects."
+- Revised: "Strategically designed and deployed robust cloud infrastructure on AWS for 3 enterprise-level projects, achieving a 20% improvement in deployment efficiency and cost reduction."
+
+Incorporate Missing Keywords:
+If you have experience with Machine Learning, add a bullet point like: "Implemented machine learning algorithms to automate data processing tasks, resulting in a 30% reduction in processing times."
+"""
+
+INTERVIEW_TASK = """You are a professional and experienced ATS(Application Tracking System) with a deep understanding of {role} fields. Analyze the provided resume and job description (JD). Generate a set of interview questions and suggested answers tailored to this specific context. The questions should be designed to explore the candidate's technical skills, experiences, and personal attributes relevant to the role, as described in the JD and evidenced in the resume. Provide 5 technical interview questions (1 easy question, 2 medium questions, 3 hard questions) focusing on the key skills and technologies mentioned in the JD and resume. The technical questions should sound specific and technical. Additionally, provide 5 HR interview questions (1 easy question, 2 medium questions, 3 hard questions) that probe into the candidate's behavioral traits, problem-solving abilities, and cultural fit for the organization. For each question, include a detailed sample answer that highlights how the candidate can effectively showcase their relevant skills, experiences, and achievements from their resume in response to the job requirements outlined in the JD.
+"""
+
+INTERVIEW_FORMAT = """Instructions for Response:
+
+Technical Questions:
+Create questions that are directly related to the technical skills and experiences mentioned in the JD and resume.
+Ensure questions cover a range of difficulties (easy, medium, hard) and are relevant to real-world scenarios the candidate might face in the role.
+
+HR Questions:
+Formulate questions that assess cultural fit, teamwork, leadership, and resilience.
+Questions should invite responses that allow the candidate to demonstrate their problem-solving approach, adaptability, and growth mindset.
+
+Suggested Answers:
+Provide comprehensive sample answers for each question, guiding the candidate on how to integrate their specific experiences and achievements from the resume.
+Highlight how each answer can align with the expectations set forth in the JD, showcasing the candidate's suitability for the role.
+
+Your Response Should have the following structure
+
+Technical Interview Questions:
+
+Question1: (Question here)
+
+Answer1: (Answer here)
+
+Similarly all other questions.
+
+HR Interview Questions:
+
+Question1: (Question here)
+
+Answer1: (Answer here)
+
+Similarly all other questions.
+"""
+
+# key -> (card title, task, output format), in button order
+ANALYSIS_PARTS = {
+    "summary": ("Resume Analysis", SUMMARY_TASK, SUMMARY_FORMAT),
+    "match": ("Percentage Match Analysis", MATCH_TASK, MATCH_FORMAT),
+    "skills": ("Skills Improvement Suggestions", SKILLS_TASK, SKILLS_FORMAT),
+    "customization": ("Customization Tips", CUSTOMIZATION_TASK, CUSTOMIZATION_FORMAT),
+    "interview": ("Interview Preparation Guide", INTERVIEW_TASK, INTERVIEW_FORMAT),
+}
+
+# key -> (card title, single-analysis prompt template)
+ANALYSES = {
+    key: (title, task + DOCUMENTS_BLOCK + output_format)
+    for key, (title, task, output_format) in ANALYSIS_PARTS.items()
+}
+
+# --------------------------
+# Skill hints
+# --------------------------
+# Keywords the local skill taxonomy already found, by category, added right
+# after the resume/JD block so the model starts from them instead of mining
+# both texts itself.
+def build_skill_hints(text, jd):
+    def listed(categories):
+        return "; ".join(
+            f"{category}: {', '.join(categories[category]) or 'None'}" for category in CATEGORIES
+        )
+
+    hints = (
+        "\nPre-extracted keywords (from a skill taxonomy; use them as a starting point):\n"
+        f"- Resume: {listed(classify(text))}\n"
+        f"- Job description: {listed(classify(jd))}\n"
+    )
+    return hints.replace("{", "{{").replace("}", "}}")
+
+
+def with_skill_hints(prompt_template, text, jd):
+    """prompt_template with the skill hints for this resume and JD inserted."""
+    if DOCUMENTS_BLOCK not in prompt_template:
+        return prompt_template
+    return prompt_template.replace(DOCUMENTS_BLOCK, DOCUMENTS_BLOCK + build_skill_hints(text, jd), 1)
+
+
+# --------------------------
+# Match Percentage final thoughts
+# --------------------------
+# The percentage and keyword lists are computed locally (keyword_scorer); the
+# model only writes the closing narrative from those results.
+MATCH_THOUGHTS_TASK = """You are a professional and experienced ATS(Application Tracking System) focused exclusively on the {{role}} field. A keyword comparison of a candidate's resume against the job description produced these results:
+
+Percentage Match: {percentage}%
+Matched Keywords: {matched}
+Missing Keywords: {missing}
+
+Write only the "Final Thoughts" for this report: 2-4 short bullet points assessing the alignment, the matched keywords, the missing elements and the percentage match. Only mention keywords listed above. Start each bullet with "- " and do not add a heading.
+"""
+
+
+def build_match_thoughts_template(result):
+    """Fill a keyword_scorer result into the final-thoughts template, leaving {role}."""
+    def listed(names):
+        return (", ".join(names) or "None").replace("{", "{{").replace("}", "}}")
+
+    matched = [name for names in result["matched"].values() for name in names]
+    return MATCH_THOUGHTS_TASK.format(
+        percentage=result["percentage"],
+        matched=listed(matched),
+        missing=listed(result["missing"]),
+    )
+
+
+# --------------------------
+# Full report
+# --------------------------
+# One request carrying the resume and JD once, answering all five analyses
+# under marker lines that split_full_report() cuts back into cards.
+SECTION_MARKER = "=== SECTION: {key} ==="
+_SECTION_RE = re.compile(r"^\s*=== SECTION: (\w+) ===\s*$", re.MULTILINE)
+
+FULL_REPORT_HEADER = """You are a professional and experienced ATS(Application Tracking System) with a deep understanding of {role} fields. You will produce several separate analyses of the same resume and job description (JD) in a single response.
+""" + DOCUMENTS_BLOCK + """
+Answer every section below, in the order given. Start each section with its marker line exactly as written, on a line of its own, and write nothing before the first marker. Follow each section's own task and structure.
+"""
+
+
+def _full_report_section(key, task, output_format):
+    return "\n{marker}\nTask: {task}\n{output_format}".format(
+        marker=SECTION_MARKER.format(key=key),
+        task=task,
+        output_format=output_format,
+    )
+
+
+# Match Percentage is scored locally (keyword_scorer), so the report leaves it
+# out and callers run it next to the report. The section texts still contain
+# {role}; it is filled with the rest.
+FULL_REPORT_KEYS = tuple(key for key in ANALYSIS_PARTS if key != "match")
+FULL_REPORT_TEMPLATE = FULL_REPORT_HEADER + "".join(
+    _full_report_section(key, *ANALYSIS_PARTS[key][1:])
+    for key in FULL_REPORT_KEYS
+)
+
+
+def split_full_report(report):
+    """Cut a full-report response into {analysis key: section text}."""
+    sections = {}
+    matches = list(_SECTION_RE.finditer(report))
+    for i, match in enumerate(matches):
+        key = match.group(1)
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(report)
+        if key in FULL_REPORT_KEYS:
+            sections[key] = report[match.end():end].strip()
+    return sections
@@ -0,0 +1,154 @@
+"""Rank a pool of resumes against a job description.
+
+    python rank_resumes.py add resumes/
+    python rank_resumes.py top --jd jd.txt --role "Data Analyst" -k 20 --summarize 5
+    python rank_resumes.py remove old_resume.pdf
+
+Resumes are extracted once and kept in a persistent inverted index
+(resume_index.py), so ranking the pool for a new JD is a BM25 query that
+takes milliseconds. The best --pool BM25 hits are then re-ordered by also
+scoring them semantically against the JD (semantic.py) in one batch, so
+resumes that describe a requirement in other words are not ranked below
+keyword-dense ones. Only the top --summarize candidates are sent to Gemini
+for the Resume Analysis summary.
+"""
+import argparse
+import os
+import sys
+
+from fanout import run_concurrently
+from gemini import analysis_model, cached_gemini_response
+from pdf_text import file_digest, input_pdf_text, read_pdf_bytes
+from prompts import ANALYSES
+from rate_limiter import BATCH, request_context
+from resume_index import ResumeIndex
+from semantic import rank_resumes as semantic_scores
+
+RERANK_POOL = 50
+
+
+def add_resumes(index, paths):
+    """Index each PDF under its content digest; unchanged files are skipped.
+
+    A changed file replaces the entry previously indexed under its name.
+    """
+    by_name = {}
+    for doc_id, name in index.documents():
+        by_name.setdefault(name, []).append(doc_id)
+    for path in paths:
+        try:
+            data = read_pdf_bytes(path)
+            doc_id = file_digest(data)
+            name = os.path.basename(path)
+            if doc_id in index:
+                status = "unchanged"
+            else:
+                index.add(doc_id, name, input_pdf_text(data))
+                status = "indexed"
+            for old_id in by_name.get(name, []):
+                if old_id != doc_id:
+                    index.remove(old_id)
+                    status = "replaced"
+            by_name[name] = [doc_id]
+        except Exception as e:
+            status = f"error: {e}"
+        print(f"{os.path.basename(path)}: {status}", file=sys.stderr)
+
+
+def remove_resumes(index, names):
+    """Drop resumes by file name or digest."""
+    for doc_id, name in index.documents():
+        if name in names or doc_id in names:
+            index.remove(doc_id)
+            print(f"{name}: removed", file=sys.stderr)
+
+
+def rerank(index, ranked, jd):
+    """[(doc_id, name, bm25, semantic)] ordered by the two scores combined.
+
+    BM25 is scaled to 0-100 against the best hit so it weighs the same as the
+    semantic score.
+    """
+    if not ranked:
+        return []
+    semantic = semantic_scores(jd, [index.get_text(doc_id) for doc_id, _, _ in ranked])
+    top_bm25 = ranked[0][2] or 1
+    combined = [(doc_id, name, bm25, score)
+                for (doc_id, name, bm25), score in zip(ranked, semantic)]
+    return sorted(combined, key=lambda r: 100 * r[2] / top_bm25 + r[3], reverse=True)
+
+
+def summarize(index, ranked, jd, role):
+    """Resume Analysis summaries for ranked candidates, {doc_id: text or error}."""
+    prompt_template = ANALYSES["summary"][1]
+    model_name = analysis_model("summary")
+    texts = {doc_id: index.get_text(doc_id) for doc_id, *_ in ranked}
+    def summarize_one(text):
+        with request_context(BATCH):
+            return cached_gemini_response(prompt_template, role, text, jd, model_name=model_name)
+
+    summaries = {}
+    for doc_id, response, error in run_concurrently(summarize_one, texts):
+        summaries[doc_id] = f"Error: {error}" if error else response
+    return summaries
+
+
+def _pdf_paths(targets):
+    for target in targets:
+        if os.path.isdir(target):
+            yield from sorted(
+                os.path.join(target, name)
+                for name in os.listdir(target)
+                if name.lower().endswith(".pdf")
+            )
+        else:
+            yield target
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank indexed resumes against a job description.")
+    parser.add_argument("--index", help="index database (default: $RESUME_INDEX_PATH)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="index resume PDFs or directories of PDFs")
+    add.add_argument("paths", nargs="+")
+
+    remove = commands.add_parser("remove", help="remove resumes by file name or digest")
+    remove.add_argument("names", nargs="+")
+
+    top = commands.add_parser("top", help="top-K resumes for a job description")
+    top.add_argument("--jd", required=True, help="text file with the job description")
+    top.add_argument("--role", default="", help="job role, used for the Gemini summaries")
+    top.add_argument("-k", type=int, default=10, help="number of candidates to list")
+    top.add_argument("--pool", type=int, default=RERANK_POOL,
+                     help="BM25 hits re-ranked with the semantic score (0 to skip)")
+    top.add_argument("--summarize", type=int, default=0, metavar="N",
+                     help="send the top N candidates to Gemini for a Resume Analysis")
+    args = parser.parse_args(argv)
+
+    index = ResumeIndex(args.index) if args.index else ResumeIndex()
+    if args.command == "add":
+        add_resumes(index, _pdf_paths(args.paths))
+    elif args.command == "remove":
+        remove_resumes(index, set(args.names))
+    else:
+        with open(args.jd, encoding="utf-8") as f:
+            jd = f.read()
+        wanted = max(args.k, args.summarize)
+        hits = index.search(jd, max(wanted, args.pool))
+        if args.pool:
+            ranked = rerank(index, hits, jd)[:wanted]
+        else:
+            ranked = [(doc_id, name, bm25, None) for doc_id, name, bm25 in hits[:wanted]]
+        summaries = summarize(index, ranked[:args.summarize], jd, args.role) if args.summarize else {}
+        print(f"{len(hits)} of {len(index)} resumes matched", file=sys.stderr)
+        for rank, (doc_id, name, bm25, semantic) in enumerate(ranked, start=1):
+            semantic = "" if semantic is None else f"{semantic:3d}%  "
+            print(f"{rank:>3}. {bm25:7.2f}  {semantic}{name}")
+            if doc_id in summaries:
+                print(summaries[doc_id], end="\n\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+import heapq
+import itertools
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from google.api_core import exceptions as api_exceptions
+
+logger = logging.getLogger(__name__)
+
+# --------------------------
+# Gemini request scheduler
+# --------------------------
+# Every Gemini call in the process goes through a token bucket per model, so
+# concurrent sessions and batch jobs share the quota instead of tripping it
+# together. Waiting calls are served by priority (interactive clicks before
+# batch work), then first come first served. A 429 halves the request rate
+# and pauses the bucket; each success wins back a little of the configured
+# rate, so throughput settles just under the real quota.
+GEMINI_RPM = float(os.getenv("GEMINI_RPM", 60))
+GEMINI_BURST = int(os.getenv("GEMINI_BURST", 5))
+GEMINI_MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", 3))
+BACKOFF_BASE_SECONDS = 2.0
+BACKOFF_MAX_SECONDS = 60.0
+MIN_RATE_FRACTION = 0.1
+RECOVERY_FRACTION = 0.05
+
+INTERACTIVE = 0
+BATCH = 1
+
+_priority = ContextVar("gemini_priority", default=INTERACTIVE)
+_on_queue = ContextVar("gemini_on_queue", default=None)
+
+
+class RateLimited(RuntimeError):
+    """Gemini kept answering 429 after GEMINI_MAX_RETRIES retries."""
+
+
+@contextmanager
+def request_context(priority=INTERACTIVE, on_queue=None):
+    """Schedule Gemini calls made inside the block at priority.
+
+    on_queue(position) is called from the waiting thread whenever the number
+    of requests ahead changes, and with 0 once the call is sent.
+    """
+    priority_token = _priority.set(priority)
+    queue_token = _on_queue.set(on_queue)
+    try:
+        yield
+    finally:
+        _priority.reset(priority_token)
+        _on_queue.reset(queue_token)
+
+
+def is_rate_limited(error):
+    return isinstance(error, (api_exceptions.ResourceExhausted, api_exceptions.TooManyRequests)) \
+        or getattr(error, "code", None) == 429
+
+
+class Scheduler:
+    def __init__(self, rpm=GEMINI_RPM, burst=GEMINI_BURST, max_retries=GEMINI_MAX_RETRIES):
+        self.max_rate = rpm / 60.0
+        self.rate = self.max_rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._throttles = 0
+        self._waiting = []  # heap of (priority, sequence)
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _wait_for_token(self, now):
+        """Seconds until the head of the queue may go; 0 consumes a token."""
+        if now < self._paused_until:
+            return self._paused_until - now
+        self._refill(now)
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0
+        return (1 - self._tokens) / self.rate
+
+    def acquire(self, priority=INTERACTIVE, on_queue=None):
+        ticket = (priority, next(self._sequence))
+        with self._cond:
+            heapq.heappush(self._waiting, ticket)
+        reported = None
+        try:
+            while True:
+                with self._cond:
+                    if self._waiting[0] == ticket:
+                        wait = self._wait_for_token(time.monotonic())
+                        if wait == 0:
+                            heapq.heappop(self._waiting)
+                            self._cond.notify_all()
+                            break
+                        position = 1
+                    else:
+                        wait = 0.25
+                        position = 1 + sum(1 for other in self._waiting if other < ticket)
+                if on_queue is not None and position != reported:
+                    on_queue(position)
+                    reported = position
+                with self._cond:
+                    self._cond.wait(min(wait, 0.25))
+        except BaseException:
+            with self._cond:
+                if ticket in self._waiting:
+                    self._waiting.remove(ticket)
+                    heapq.heapify(self._waiting)
+                    self._cond.notify_all()
+            raise
+        if on_queue is not None and reported:
+            on_queue(0)
+
+    def throttled(self, retry_after=None):
+        with self._cond:
+            self._throttles += 1
+            self.rate = max(self.max_rate * MIN_RATE_FRACTION, self.rate / 2)
+            backoff = retry_after or min(BACKOFF_MAX_SECONDS,
+                                         BACKOFF_BASE_SECONDS * 2 ** (self._throttles - 1))
+            self._paused_until = time.monotonic() + backoff * random.uniform(1, 1.25)
+            self._tokens = 0
+            logger.warning("Gemini rate limited; rate now %.2f req/s, pausing %.1fs",
+                           self.rate, backoff)
+
+    def succeeded(self):
+        with self._cond:
+            self._throttles = 0
+            self.rate = min(self.max_rate, self.rate + self.max_rate * RECOVERY_FRACTION)
+
+    def queue_length(self):
+        with self._cond:
+            return len(self._waiting)
+
+    def call(self, fn, *args, **kwargs):
+        """fn(*args, **kwargs) once the quota allows, retrying 429s with backoff."""
+        priority, on_queue = _priority.get(), _on_queue.get()
+        for attempt in range(self.max_retries + 1):
+            self.acquire(priority, on_queue)
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                if not is_rate_limited(e):
+                    raise
+                self.throttled()
+                if attempt == self.max_retries:
+                    raise RateLimited("Gemini quota exceeded; please try again in a minute.") from e
+                continue
+            self.succeeded()
+            return result
+
+
+_schedulers = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_scheduler(model_name):
+    """The process-wide scheduler for model_name (quotas are per model)."""
+    with _schedulers_lock:
+        scheduler = _schedulers.get(model_name)
+        if scheduler is None:
+            scheduler = _schedulers[model_name] = Scheduler()
+        return scheduler
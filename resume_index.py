@@ -0,0 +1,136 @@
+import heapq
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter, defaultdict
+
+from skill_taxonomy import normalize
+
+INDEX_PATH = os.getenv("RESUME_INDEX_PATH", os.path.join(".cache", "resume_index.sqlite3"))
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+STOPWORDS = frozenset("""
+a about above after again all also am an and any are as at be been being below between both
+but by can could did do does doing down during each few for from further had has have having
+he her here hers him his how i if in into is it its itself just me more most my no nor not of
+off on once only or other our ours out over own same she should so some such than that the
+their theirs them then there these they this those through to too under until up very was we
+were what when where which while who whom why will with would you your yours
+""".split())
+
+
+def index_terms(text):
+    return [term for term in normalize(text) if term not in STOPWORDS and len(term) > 1]
+
+
+# --------------------------
+# Resume pool index
+# --------------------------
+# Inverted index over extracted resume text. Postings live in memory for
+# millisecond BM25 queries and are mirrored to SQLite so the pool survives
+# restarts; resumes can be added or removed one at a time.
+class ResumeIndex:
+    def __init__(self, path=INDEX_PATH):
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS resumes ("
+            " doc_id TEXT PRIMARY KEY, name TEXT NOT NULL, text TEXT NOT NULL,"
+            " length INTEGER NOT NULL, added_at REAL NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS postings ("
+            " term TEXT NOT NULL, doc_id TEXT NOT NULL, tf INTEGER NOT NULL,"
+            " PRIMARY KEY (term, doc_id));"
+            "CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc_id);"
+        )
+        self._postings = defaultdict(dict)  # term -> {doc_id: tf}
+        self._lengths = {}
+        self._names = {}
+        for doc_id, name, length in self._conn.execute("SELECT doc_id, name, length FROM resumes"):
+            self._lengths[doc_id] = length
+            self._names[doc_id] = name
+        for term, doc_id, tf in self._conn.execute("SELECT term, doc_id, tf FROM postings"):
+            self._postings[term][doc_id] = tf
+        self._total_length = sum(self._lengths.values())
+
+    def __len__(self):
+        return len(self._lengths)
+
+    def __contains__(self, doc_id):
+        return doc_id in self._lengths
+
+    def add(self, doc_id, name, text):
+        """Index (or re-index) one resume under doc_id, e.g. its file digest."""
+        counts = Counter(index_terms(text))
+        length = sum(counts.values())
+        with self._lock:
+            self._remove(doc_id)
+            self._conn.execute(
+                "INSERT INTO resumes (doc_id, name, text, length, added_at) VALUES (?, ?, ?, ?, ?)",
+                (doc_id, name, text, length, time.time()),
+            )
+            self._conn.executemany(
+                "INSERT INTO postings (term, doc_id, tf) VALUES (?, ?, ?)",
+                ((term, doc_id, tf) for term, tf in counts.items()),
+            )
+            self._conn.commit()
+            for term, tf in counts.items():
+                self._postings[term][doc_id] = tf
+            self._lengths[doc_id] = length
+            self._names[doc_id] = name
+            self._total_length += length
+
+    def remove(self, doc_id):
+        with self._lock:
+            self._remove(doc_id)
+            self._conn.commit()
+
+    def _remove(self, doc_id):
+        if doc_id not in self._lengths:
+            return
+        for (term,) in self._conn.execute("SELECT term FROM postings WHERE doc_id = ?", (doc_id,)):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._conn.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+        self._conn.execute("DELETE FROM resumes WHERE doc_id = ?", (doc_id,))
+        self._total_length -= self._lengths.pop(doc_id)
+        self._names.pop(doc_id, None)
+
+    def documents(self):
+        """[(doc_id, name)] for every indexed resume, newest first."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT doc_id, name FROM resumes ORDER BY added_at DESC"
+            ).fetchall()
+
+    def get_text(self, doc_id):
+        with self._lock:
+            row = self._conn.execute("SELECT text FROM resumes WHERE doc_id = ?", (doc_id,)).fetchone()
+        return row[0] if row else None
+
+    def search(self, query, k=10):
+        """Top-k [(doc_id, name, bm25 score)] for query (typically the JD)."""
+        with self._lock:
+            n = len(self._lengths)
+            if not n:
+                return []
+            average_length = self._total_length / n or 1
+            scores = defaultdict(float)
+            for term, qtf in Counter(index_terms(query)).items():
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * self._lengths[doc_id] / average_length)
+                    scores[doc_id] += qtf * idf * tf * (BM25_K1 + 1) / (tf + norm)
+            top = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+            return [(doc_id, self._names[doc_id], score) for doc_id, score in top]
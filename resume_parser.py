@@ -0,0 +1,141 @@
+import os
+import re
+import threading
+
+from cachetools import LRUCache
+
+from compaction import clean_lines, section_of, split_sections
+from pdf_text import file_digest, input_pdf_text, read_pdf_bytes
+
+# --------------------------
+# Resume document model
+# --------------------------
+# A resume is parsed once into sections (Summary, Experience, Education,
+# Skills, Projects, ...) holding their lines and bullet points, so each
+# analysis can send only the parts of the resume it needs. Records use
+# __slots__: a worker may hold hundreds of parsed resumes.
+DOCUMENT_CACHE_SIZE = int(os.getenv("RESUME_DOCUMENT_CACHE_SIZE", 256))
+
+_BULLET_RE = re.compile(r"^(?:[•·▪◦●○■□➢➤►✓✔\-*–]|\(?\d{1,2}[.)])\s*")
+
+
+class Bullet:
+    __slots__ = ("section", "text")
+
+    def __init__(self, section, text):
+        self.section = section
+        self.text = text
+
+    def __repr__(self):
+        return f"Bullet({self.section!r}, {self.text!r})"
+
+
+class Section:
+    __slots__ = ("name", "heading", "lines", "bullets")
+
+    def __init__(self, name, heading, lines, bullets):
+        self.name = name
+        self.heading = heading
+        self.lines = lines
+        self.bullets = bullets
+
+    def render(self):
+        body = "\n".join(self.lines)
+        return f"{self.heading}\n{body}" if self.heading else body
+
+    def __repr__(self):
+        return f"Section({self.name!r}, {len(self.lines)} lines, {len(self.bullets)} bullets)"
+
+
+class ResumeDocument:
+    __slots__ = ("text", "sections")
+
+    def __init__(self, text, sections):
+        self.text = text
+        self.sections = sections
+
+    def section_names(self):
+        return [section.name for section in self.sections]
+
+    def get(self, *names):
+        """Sections with any of the given names, in document order."""
+        return [section for section in self.sections if section.name in names]
+
+    def bullets(self, *names):
+        sections = self.get(*names) if names else self.sections
+        return [bullet for section in sections for bullet in section.bullets]
+
+    def render(self, *names):
+        """Text of the named sections, headings included."""
+        return "\n\n".join(section.render() for section in self.get(*names))
+
+    def __repr__(self):
+        return f"ResumeDocument({self.section_names()!r})"
+
+
+def _parse_section(name, lines):
+    heading = lines[0] if section_of(lines[0]) is not None else None
+    body = lines[1:] if heading else lines
+    bullets = []
+    for line in body:
+        marker = _BULLET_RE.match(line)
+        if marker:
+            bullets.append(Bullet(name, line[marker.end():]))
+        elif bullets and line[:1].islower():
+            # PDF extraction wraps long bullets; lowercase starts continue one.
+            bullets[-1].text += " " + line
+    return Section(name, heading, body, bullets)
+
+
+def parse_resume(text):
+    """ResumeDocument for extracted resume text."""
+    lines = clean_lines(text)
+    sections = [_parse_section(name, body) for name, body in split_sections(lines)]
+    return ResumeDocument("\n".join(lines), sections)
+
+
+_document_cache = LRUCache(maxsize=DOCUMENT_CACHE_SIZE)
+_document_cache_lock = threading.Lock()
+
+
+def parse_pdf(uploaded_file):
+    """ResumeDocument for a PDF, parsed once per file content."""
+    data = read_pdf_bytes(uploaded_file)
+    key = file_digest(data)
+    with _document_cache_lock:
+        document = _document_cache.get(key)
+    if document is None:
+        document = parse_resume(input_pdf_text(data))
+        with _document_cache_lock:
+            _document_cache[key] = document
+    return document
+
+
+# --------------------------
+# Per-analysis resume text
+# --------------------------
+# Sections each analysis reads; None sends the whole resume. Customization
+# Tips rewrites bullet points, so it gets just the bullets.
+ANALYSIS_SECTIONS = {
+    "summary": None,
+    "match": ("Summary", "Skills", "Experience", "Projects", "Certifications"),
+    "skills": ("Summary", "Skills", "Experience", "Projects", "Certifications"),
+    "customization": ("Experience", "Projects"),
+    "interview": ("Summary", "Skills", "Experience", "Projects", "Achievements"),
+}
+
+
+def analysis_text(document, key):
+    """The part of the resume sent with analysis key.
+
+    Falls back to the whole resume when the sections it needs were not
+    found (e.g. a resume without recognisable headings).
+    """
+    names = ANALYSIS_SECTIONS.get(key)
+    if names is None:
+        return document.text
+    if key == "customization":
+        bullets = document.bullets(*names)
+        if bullets:
+            return "\n".join(f"- {bullet.text}" for bullet in bullets)
+    return document.render(*names) or document.text
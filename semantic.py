@@ -0,0 +1,132 @@
+import os
+import re
+import threading
+
+import numpy as np
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:  # optional; the hashed embedding below needs only NumPy
+    SentenceTransformer = None
+
+# A sentence-transformers model name (e.g. all-MiniLM-L6-v2) switches on
+# model embeddings; unset, texts are embedded with hashed character n-grams.
+SEMANTIC_MODEL = os.getenv("SEMANTIC_MODEL")
+HASH_DIM = int(os.getenv("SEMANTIC_HASH_DIM", 1024))
+
+RESUME_CHUNK_CHARS = 300
+MIN_REQUIREMENT_WORDS = 3
+
+_SPLIT_RE = re.compile(r"(?:\n|•|·|▪|(?<=[.;!?])\s+)")
+_SPACE_RE = re.compile(r"\s+")
+
+_model = None
+_model_lock = threading.Lock()
+
+
+# --------------------------
+# Embeddings
+# --------------------------
+def _get_model():
+    global _model
+    with _model_lock:
+        if _model is None:
+            _model = SentenceTransformer(SEMANTIC_MODEL, device="cpu")
+        return _model
+
+
+def _hashed_embedding(text):
+    # Character trigrams hashed into HASH_DIM signed buckets, computed on the
+    # byte array at once rather than per n-gram in Python.
+    data = np.frombuffer(f" {_SPACE_RE.sub(' ', text.lower())} ".encode("utf-8"), dtype=np.uint8)
+    vector = np.zeros(HASH_DIM, dtype=np.float32)
+    if len(data) < 3:
+        return vector
+    data = data.astype(np.uint32)
+    h = (data[:-2] * np.uint32(16777619)) ^ (data[1:-1] * np.uint32(2166136261)) ^ (data[2:] * np.uint32(40503))
+    h = h * np.uint32(2654435761)
+    signs = np.where(h & np.uint32(1 << 31), -1.0, 1.0)
+    vector += np.bincount(h % np.uint32(HASH_DIM), weights=signs, minlength=HASH_DIM).astype(np.float32)
+    return vector
+
+
+def embed(texts):
+    """L2-normalised embeddings, one row per text."""
+    if not texts:
+        return np.zeros((0, HASH_DIM), dtype=np.float32)
+    if SEMANTIC_MODEL and SentenceTransformer is not None:
+        return np.asarray(_get_model().encode(list(texts), normalize_embeddings=True), dtype=np.float32)
+    matrix = np.vstack([_hashed_embedding(text) for text in texts])
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-9)
+
+
+# --------------------------
+# Segmentation
+# --------------------------
+def requirement_lines(jd):
+    """JD lines/sentences long enough to state a requirement."""
+    lines = (_SPACE_RE.sub(" ", line).strip(" -*\t") for line in _SPLIT_RE.split(jd))
+    return [line for line in lines if len(line.split()) >= MIN_REQUIREMENT_WORDS]
+
+
+def resume_chunks(text):
+    """Resume lines packed into chunks of about RESUME_CHUNK_CHARS characters."""
+    chunks, current = [], ""
+    for line in _SPLIT_RE.split(text):
+        line = _SPACE_RE.sub(" ", line).strip()
+        if not line:
+            continue
+        if current and len(current) + len(line) > RESUME_CHUNK_CHARS:
+            chunks.append(current)
+            current = line
+        else:
+            current = f"{current} {line}".strip()
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+# --------------------------
+# Scoring
+# --------------------------
+def semantic_match(text, jd):
+    """Compare one resume with a JD.
+
+    Each requirement line is matched to its closest resume chunk by cosine
+    similarity; the score is their mean as a percentage. Returns
+    {"score", "requirements": [(line, similarity, best chunk)]}, weakest first.
+    """
+    requirements = requirement_lines(jd)
+    chunks = resume_chunks(text)
+    if not requirements or not chunks:
+        return {"score": 0, "requirements": []}
+    similarity = embed(requirements) @ embed(chunks).T
+    best = similarity.argmax(axis=1)
+    best_scores = similarity[np.arange(len(requirements)), best]
+    details = sorted(
+        ((line, float(score), chunks[i]) for line, score, i in zip(requirements, best_scores, best)),
+        key=lambda detail: detail[1],
+    )
+    return {"score": round(100 * float(np.clip(best_scores, 0, 1).mean())), "requirements": details}
+
+
+def rank_resumes(jd, texts):
+    """Semantic score (0-100) for each resume text against one JD, in input order.
+
+    The JD is embedded once and all resume chunks go through a single batched
+    matrix product, so large pools score in one pass.
+    """
+    requirements = embed(requirement_lines(jd))
+    chunk_lists = [resume_chunks(text) for text in texts]
+    counts = np.array([len(chunks) for chunks in chunk_lists])
+    scores = np.zeros(len(texts))
+    if not len(requirements) or not counts.sum():
+        return scores.tolist()
+    chunks = embed([chunk for chunks in chunk_lists for chunk in chunks])
+    similarity = requirements @ chunks.T
+    has_chunks = counts > 0
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[has_chunks]
+    best = np.maximum.reduceat(similarity, starts, axis=1)
+    scores[has_chunks] = 100 * np.clip(best, 0, 1).mean(axis=0)
+    return np.round(scores).astype(int).tolist()
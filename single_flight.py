@@ -0,0 +1,94 @@
+import threading
+
+# --------------------------
+# Single-flight call coalescing
+# --------------------------
+# Identical requests that arrive while one is already running (a double
+# click, two tabs on the same resume and JD) wait for that call and share its
+# result instead of starting their own. A real failure is shared as well; if
+# the running call was abandoned instead (its caller went away, e.g. a
+# Streamlit rerun stopped the script), one of the waiters takes over.
+ABANDONED = object()
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "abandoned")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.abandoned = False
+
+
+class Flight:
+    """Handle returned by SingleFlight.claim(); exactly one holder leads."""
+
+    __slots__ = ("_group", "_key", "_call", "leader")
+
+    def __init__(self, group, key, call, leader):
+        self._group = group
+        self._key = key
+        self._call = call
+        self.leader = leader
+
+    def wait(self):
+        """Follower: the leader's result, or ABANDONED if it gave up."""
+        self._call.done.wait()
+        if self._call.error is not None:
+            raise self._call.error
+        return ABANDONED if self._call.abandoned else self._call.result
+
+    def finish(self, result):
+        self._group._settle(self._key, self._call, result=result)
+
+    def fail(self, error):
+        if isinstance(error, Exception):
+            self._group._settle(self._key, self._call, error=error)
+        else:
+            self._group._settle(self._key, self._call, abandoned=True)
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def claim(self, key):
+        """Flight for key: leader=True means the caller must run it and settle it."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                return Flight(self, key, call, leader=True)
+            self.coalesced += 1
+            return Flight(self, key, call, leader=False)
+
+    def _settle(self, key, call, result=None, error=None, abandoned=False):
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+        call.result, call.error, call.abandoned = result, error, abandoned
+        call.done.set()
+
+    def do(self, key, fn, *args, **kwargs):
+        """fn(*args, **kwargs), shared with identical calls already in flight."""
+        while True:
+            flight = self.claim(key)
+            if not flight.leader:
+                result = flight.wait()
+                if result is not ABANDONED:
+                    return result
+                continue
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                flight.fail(e)
+                raise
+            flight.finish(result)
+            return result
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
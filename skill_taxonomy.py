@@ -0,0 +1,112 @@
+import json
+import os
+import re
+import threading
+from collections import Counter
+
+CATEGORIES = ("Skills", "Technologies", "Methodologies")
+
+SKILLS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "skills.json")
+# Optional extra taxonomy in the same {category: {canonical: [synonyms]}}
+# format, merged over the bundled one (e.g. a full ESCO/O*NET export).
+EXTRA_SKILLS_PATH = os.getenv("SKILL_TAXONOMY_PATH")
+
+_NON_TERM_RE = re.compile(r"[^a-z0-9+#.&]+")
+_NON_TERM_CASED_RE = re.compile(r"[^A-Za-z0-9+#.&]+")
+_MATCH = "\0"  # trie key holding (canonical name, category) at a phrase end
+
+
+def normalize(text):
+    """Lowercase and split into terms, keeping skill punctuation (c++, c#, node.js)."""
+    terms = (term.rstrip(".") for term in _NON_TERM_RE.split(text.lower()))
+    return [term for term in terms if term]
+
+
+def _cased_terms(text):
+    """normalize(text) without the lowercasing."""
+    terms = (term.rstrip(".") for term in _NON_TERM_CASED_RE.split(text))
+    return [term for term in terms if term]
+
+
+# Skill names and synonyms that are also everyday words ("react quickly",
+# "you will excel", "spark ideas"). On their own they only count when not
+# written all in lowercase ("React", "EXCEL"); longer phrases ("react
+# native", "microsoft excel") and other synonyms match as usual.
+CASE_SENSITIVE_WORDS = frozenset((
+    "chef", "dart", "elk", "excel", "flask", "hive", "jest", "lambda", "lean", "mocha",
+    "oracle", "puppet", "react", "ruby", "rust", "safe", "sketch", "soap", "spark",
+    "spring", "swift", "torch", "transformers", "unity",
+))
+
+
+# --------------------------
+# Taxonomy index
+# --------------------------
+# Every canonical name and synonym is compiled into a trie over normalised
+# terms, built lazily on first use and shared by the whole process. A text is
+# then classified in one left-to-right pass, taking the longest phrase that
+# starts at each position ("react native" over "react").
+_trie = None
+_trie_lock = threading.Lock()
+
+
+def _load_taxonomy():
+    paths = [SKILLS_PATH] + ([EXTRA_SKILLS_PATH] if EXTRA_SKILLS_PATH else [])
+    taxonomy = {category: {} for category in CATEGORIES}
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for category, entries in json.load(f).items():
+                taxonomy.setdefault(category, {}).update(entries)
+    return taxonomy
+
+
+def _build_trie(taxonomy):
+    root = {}
+    for category, entries in taxonomy.items():
+        for canonical, synonyms in entries.items():
+            for name in (canonical, *synonyms):
+                node = root
+                for term in normalize(name):
+                    node = node.setdefault(term, {})
+                node.setdefault(_MATCH, (canonical, category))
+    return root
+
+
+def get_trie():
+    global _trie
+    if _trie is None:
+        with _trie_lock:
+            if _trie is None:
+                _trie = _build_trie(_load_taxonomy())
+    return _trie
+
+
+def extract(text):
+    """Counter of {(canonical name, category): occurrences} found in text."""
+    root = get_trie()
+    cased = _cased_terms(text)
+    terms = [term.lower() for term in cased]
+    found = Counter()
+    i = 0
+    while i < len(terms):
+        node, j, last = root, i, None
+        while j < len(terms) and terms[j] in node:
+            node = node[terms[j]]
+            j += 1
+            if _MATCH in node and not (
+                    j == i + 1 and terms[i] in CASE_SENSITIVE_WORDS and cased[i].islower()):
+                last = (node[_MATCH], j)
+        if last:
+            found[last[0]] += 1
+            i = last[1]
+        else:
+            i += 1
+    return found
+
+
+def classify(text):
+    """{category: [canonical names]} for text, most frequent first."""
+    categories = {category: [] for category in CATEGORIES}
+    for (name, category), _ in extract(text).most_common():
+        categories.setdefault(category, []).append(name)
+    return categories
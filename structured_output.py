@@ -0,0 +1,225 @@
+import json
+import re
+
+from jsonschema import Draft202012Validator
+
+from gemini import DEFAULT_MODEL, cached_gemini_response
+from prompts import ANALYSIS_PARTS, DOCUMENTS_BLOCK
+from skill_taxonomy import CATEGORIES
+
+# --------------------------
+# Structured (JSON) analyses
+# --------------------------
+# Each analysis can also be requested as JSON matching a schema, so the match
+# percentage, keyword lists and suggestions can be cached, aggregated and
+# exported without re-parsing prose. Responses are validated and, where the
+# model strayed from the schema, repaired before use; the markdown card is
+# rendered from the validated data.
+_STRINGS = {"type": "array", "items": {"type": "string"}}
+
+
+def _object(properties):
+    return {"type": "object", "properties": properties, "required": list(properties)}
+
+
+_QUESTION = _object({
+    "difficulty": {"type": "string", "enum": ["easy", "medium", "hard"]},
+    "question": {"type": "string"},
+    "answer": {"type": "string"},
+})
+
+SCHEMAS = {
+    "summary": _object({
+        "overview": {"type": "string"},
+        "strengths": _STRINGS,
+        "relevant_experiences": _STRINGS,
+    }),
+    "match": _object({
+        "percentage": {"type": "number", "minimum": 0, "maximum": 100},
+        "matched": _object({category: _STRINGS for category in CATEGORIES}),
+        "missing": _STRINGS,
+        "final_thoughts": _STRINGS,
+    }),
+    "skills": _object({
+        "suggestions": {"type": "array", "items": _object({
+            "area": {"type": "string"},
+            "actions": _STRINGS,
+        })},
+    }),
+    "customization": _object({
+        "bullet_rewrites": {"type": "array", "items": _object({
+            "current": {"type": "string"},
+            "revised": {"type": "string"},
+        })},
+        "missing_keywords": _STRINGS,
+    }),
+    "interview": _object({
+        "technical": {"type": "array", "items": _QUESTION},
+        "hr": {"type": "array", "items": _QUESTION},
+    }),
+}
+
+_VALIDATORS = {key: Draft202012Validator(schema) for key, schema in SCHEMAS.items()}
+
+
+class StructuredOutputError(ValueError):
+    """The response could not be turned into JSON matching the schema."""
+
+
+JSON_FORMAT = """Respond only with a single JSON object, without markdown fences or any text around it, matching this JSON schema:
+{schema}
+Only mention content present in the provided resume and job description.
+"""
+
+
+def json_template(key):
+    """Prompt template for analysis key asking for JSON instead of prose."""
+    _, task, _ = ANALYSIS_PARTS[key]
+    schema = json.dumps(SCHEMAS[key]).replace("{", "{{").replace("}", "}}")
+    return task + DOCUMENTS_BLOCK + JSON_FORMAT.replace("{schema}", schema)
+
+
+# --------------------------
+# Parsing and repair
+# --------------------------
+_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$", re.IGNORECASE)
+_TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+_NUMBER_RE = re.compile(r"-?\d+(?:\.\d+)?")
+_LIST_ITEM_RE = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s*")
+_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+
+
+def _load_json(response):
+    body = _FENCE_RE.sub("", response.strip())
+    start, end = body.find("{"), body.rfind("}")
+    if start < 0 or end < start:
+        raise StructuredOutputError("no JSON object in response")
+    body = body[start:end + 1]
+    try:
+        return json.loads(body)
+    except json.JSONDecodeError:
+        pass
+    try:
+        return json.loads(_TRAILING_COMMA_RE.sub(r"\1", body.translate(_QUOTES)))
+    except json.JSONDecodeError as e:
+        raise StructuredOutputError(f"invalid JSON: {e}") from e
+
+
+def _coerce(value, schema):
+    """Reshape value towards schema: wrap/split lists, parse "72%" numbers.
+
+    Only values that are present are touched. A missing field, or one that
+    cannot be read as its type, is left as it is for validation to reject.
+    """
+    kind = schema.get("type")
+    if kind == "object":
+        if not isinstance(value, dict):
+            return value
+        return {name: _coerce(item, schema.get("properties", {}).get(name, {}))
+                for name, item in value.items()}
+    if kind == "array":
+        if isinstance(value, str):
+            value = [_LIST_ITEM_RE.sub("", line) for line in value.splitlines() if line.strip()]
+        elif value is not None and not isinstance(value, list):
+            value = [value]
+        if not isinstance(value, list):
+            return value
+        return [_coerce(item, schema.get("items", {})) for item in value]
+    if kind == "number" and isinstance(value, str):
+        match = _NUMBER_RE.fullmatch(value.strip().rstrip("%").strip())
+        return float(match.group()) if match else value
+    if kind == "string":
+        if isinstance(value, list):
+            value = "\n".join(str(item) for item in value)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            value = str(value)
+        if "enum" in schema and isinstance(value, str):
+            return value.strip().lower()
+        return value
+    return value
+
+
+def parse_structured(key, response):
+    """Validated analysis data for key from a model response, repaired if needed.
+
+    Raises StructuredOutputError when required fields are missing or a value
+    cannot be read as its type, so callers can ask again.
+    """
+    data = _load_json(response)
+    validator = _VALIDATORS[key]
+    if validator.is_valid(data):
+        return data
+    data = _coerce(data, SCHEMAS[key])
+    errors = [error.message for error in validator.iter_errors(data)]
+    if errors:
+        raise StructuredOutputError("; ".join(errors[:3]))
+    return data
+
+
+# --------------------------
+# Markdown rendering
+# --------------------------
+def _bullets(items):
+    return "\n".join(f"- {item}" for item in items) or "- None"
+
+
+def _questions(questions):
+    return "\n\n".join(
+        f"Question{i} ({q['difficulty']}): {q['question']}\n\nAnswer{i}: {q['answer']}"
+        for i, q in enumerate(questions, start=1)
+    )
+
+
+def render_markdown(key, data):
+    """Card text for validated analysis data, in the prose format's layout."""
+    if key == "summary":
+        return (f"Overview:\n{data['overview']}\n\nStrengths:\n{_bullets(data['strengths'])}"
+                f"\n\nRelevant Experiences:\n{_bullets(data['relevant_experiences'])}")
+    if key == "match":
+        matched = "\n".join(f"- {category}: {', '.join(names) or 'None'}"
+                            for category, names in data["matched"].items())
+        return (f"Percentage Match: {data['percentage']:g}%\n\nMatched Keywords:\n{matched}"
+                f"\n\nMissing Keywords:\n{_bullets(data['missing'])}"
+                f"\n\nFinal Thoughts:\n{_bullets(data['final_thoughts'])}")
+    if key == "skills":
+        return "\n\n".join(f"{s['area']}:\n{_bullets(s['actions'])}" for s in data["suggestions"])
+    if key == "customization":
+        rewrites = "\n\n".join(f"- Current: \"{r['current']}\"\n- Revised: \"{r['revised']}\""
+                               for r in data["bullet_rewrites"])
+        return f"Tailor Bullet Points:\n{rewrites}\n\nIncorporate Missing Keywords:\n{_bullets(data['missing_keywords'])}"
+    if key == "interview":
+        return (f"Technical Interview Questions:\n\n{_questions(data['technical'])}"
+                f"\n\nHR Interview Questions:\n\n{_questions(data['hr'])}")
+    raise KeyError(key)
+
+
+def structured_analysis(key, prompt_template, role, text, jd, refresh=False,
+                        model_name=DEFAULT_MODEL):
+    """(data, markdown) for analysis key, asked in JSON mode.
+
+    prompt_template is json_template(key), possibly with skill hints added.
+    A stored answer that no longer parses is regenerated once.
+    """
+    response = cached_gemini_response(prompt_template, role, text, jd, refresh=refresh,
+                                      model_name=model_name, json_mode=True)
+    try:
+        data = parse_structured(key, response)
+    except StructuredOutputError:
+        if refresh:
+            raise
+        response = cached_gemini_response(prompt_template, role, text, jd, refresh=True,
+                                          model_name=model_name, json_mode=True)
+        data = parse_structured(key, response)
+    return data, render_markdown(key, data)
+
+
+def match_data(result, final_thoughts):
+    """Match data in SCHEMAS["match"] form from a local keyword_scorer result
+    and the model's bulleted final thoughts."""
+    thoughts = [line.strip().lstrip("-*•").strip() for line in (final_thoughts or "").splitlines()]
+    return {
+        "percentage": result["percentage"],
+        "matched": result["matched"],
+        "missing": result["missing"],
+        "final_thoughts": [line for line in thoughts if line],
+    }
@@ -0,0 +1,184 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+
+logger = logging.getLogger(__name__)
+
+# --------------------------
+# Timing spans
+# --------------------------
+# `with span("gemini.generate", model=...):` times a block of a request.
+# Spans nest through a context variable and are written, one JSON object per
+# line, in the OpenTelemetry span layout (traceId, spanId, parentSpanId,
+# start/end in unix nanoseconds, attributes, status) so the file can be fed
+# to an OTLP/JSON tool. With TRACE unset, span() hands back a shared no-op
+# object: one function call and a flag check per block.
+TRACE_ENABLED = os.getenv("TRACE", "").lower() in ("1", "true", "yes")
+TRACE_PATH = os.getenv("TRACE_PATH", os.path.join(".cache", "traces.jsonl"))
+TRACE_SERVICE_NAME = os.getenv("TRACE_SERVICE_NAME", "intellimatch-ats")
+RECENT_SPANS = 200
+
+_current = ContextVar("trace_span", default=None)
+_recent = deque(maxlen=RECENT_SPANS)
+_export_queue = queue.SimpleQueue()
+_exporter = None
+_exporter_lock = threading.Lock()
+_write_lock = threading.Lock()
+_write_failed = False
+
+
+def enabled():
+    return TRACE_ENABLED
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set(self, **attributes):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class Span:
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "attributes",
+                 "start_ns", "end_ns", "error", "_token")
+
+    def __init__(self, name, attributes):
+        parent = _current.get()
+        self.name = name
+        self.trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent else ""
+        self.attributes = attributes
+        self.start_ns = self.end_ns = 0
+        self.error = None
+        self._token = None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def __enter__(self):
+        self._token = _current.set(self)
+        self.start_ns = time.time_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end_ns = time.time_ns()
+        _current.reset(self._token)
+        if exc is not None and isinstance(exc, Exception):
+            self.error = f"{exc_type.__name__}: {exc}"
+        _finish(self)
+        return False
+
+    @property
+    def duration_ms(self):
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def to_otel(self):
+        return {
+            "resource": {"service.name": TRACE_SERVICE_NAME},
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id,
+            "name": self.name,
+            "kind": "SPAN_KIND_INTERNAL",
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [{"key": key, "value": _otel_value(value)}
+                           for key, value in self.attributes.items()],
+            "status": ({"code": "STATUS_CODE_ERROR", "message": self.error} if self.error
+                       else {"code": "STATUS_CODE_OK"}),
+        }
+
+
+def _otel_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def span(name, **attributes):
+    """Context manager timing the enclosed block as span `name`."""
+    if not TRACE_ENABLED:
+        return _NOOP
+    return Span(name, attributes)
+
+
+def recent_spans():
+    """Most recent finished spans in this process, newest first."""
+    return list(reversed(_recent))
+
+
+# --------------------------
+# Export
+# --------------------------
+# Finished spans are queued and appended to TRACE_PATH by one background
+# thread, so the traced code never waits on file I/O.
+def _finish(finished):
+    _recent.append(finished)
+    _export_queue.put(finished)
+    _start_exporter()
+
+
+def _start_exporter():
+    global _exporter
+    if _exporter is None:
+        with _exporter_lock:
+            if _exporter is None:
+                _exporter = threading.Thread(target=_export_loop, name="trace-exporter", daemon=True)
+                _exporter.start()
+                atexit.register(flush)
+
+
+def _write(spans):
+    # The exporter thread and flush() at exit both append; the lock keeps
+    # their lines from interleaving.
+    global _write_failed
+    with _write_lock:
+        try:
+            os.makedirs(os.path.dirname(TRACE_PATH) or ".", exist_ok=True)
+            with open(TRACE_PATH, "a", encoding="utf-8") as f:
+                f.writelines(json.dumps(s.to_otel()) + "\n" for s in spans)
+        except OSError as e:
+            if not _write_failed:
+                logger.warning("Trace spans not written to %s: %s", TRACE_PATH, e)
+                _write_failed = True
+
+
+def _drain():
+    spans = []
+    while True:
+        try:
+            spans.append(_export_queue.get_nowait())
+        except queue.Empty:
+            return spans
+
+
+def _export_loop():
+    while True:
+        _write([_export_queue.get()] + _drain())
+
+
+def flush():
+    """Write any spans still queued (called at exit)."""
+    spans = _drain()
+    if spans:
+        _write(spans)